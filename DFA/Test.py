@@ -1,3 +1,21 @@
+import argparse
+import os
+import sys
+from itertools import repeat, tee
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.bounded import BoundedCache
+from lfa.config import ConfigSchema, read_config
+from lfa.stream import DEFAULT_CHUNK_SIZE, iter_symbols
+
+# Per-input error codes reported by accepts_many
+OK = 0
+INVALID_SYMBOL = 1
+NO_TRANSITION = 2
+
+
 class DFA:
     def __init__(self, states, alphabet, transition_function, start_state, accept_states):
         self.states = set(states)
@@ -6,9 +24,17 @@ class DFA:
         self.start_state = start_state
         self.accept_states = set(accept_states)
 
-    def accepts(self, input_string):
+    def accepts(self, input_string, observer=None):
+        """
+        input_string: a string of whitespace separated symbols, or any iterable of symbols
+        (e.g. iter_symbols(filename)), which is consumed lazily and only up to the first error
+        observer: an lfa.observe.Observer told about every state and transition
+        """
+        symbols = input_string.split() if isinstance(input_string, str) else input_string
+        if observer is not None:
+            return self._accepts_observed(symbols, observer)
         current_state = self.start_state
-        for symbol in input_string.split():
+        for symbol in symbols:
             if symbol not in self.alphabet:
                 raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
             key = (current_state, symbol)
@@ -17,45 +43,374 @@ class DFA:
             current_state = self.transition_function[key]
         return current_state in self.accept_states
 
+    def _accepts_observed(self, symbols, observer):
+        current_state = self.start_state
+        observer.begin()
+        observer.visit(current_state)
+        for symbol in symbols:
+            if symbol not in self.alphabet:
+                raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+            key = (current_state, symbol)
+            if key not in self.transition_function:
+                raise ValueError(f"[ERROR] No transition from state '{current_state}' on symbol '{symbol}'.")
+            current_state = self.transition_function[key]
+            observer.transition(key, current_state)
+            observer.visit(current_state)
+        return current_state in self.accept_states
 
-def parse_dfa_config(filename):
-    alphabet = []
-    states = []
-    start = None
-    accept = []
-    transitions = {}
+    def compile(self):
+        return CompiledDFA(self)
 
-    current_section = None
-    with open(filename, "r") as file:
-        for raw_line in file:
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "#" in line:
-                line = line.split("#")[0].strip()
+    def start(self):
+        return DFASession(self)
 
-            if line.endswith(":"):
-                current_section = line[:-1].strip()
+    def accepts_many(self, inputs):
+        """
+        CompiledDFA.accepts_many() on a freshly compiled DFA, so it always sees the current
+        transitions; for repeated batches, call compile() once and reuse its accepts_many().
+        """
+        return self.compile().accepts_many(inputs)
+
+    def reachable_states(self):
+        reachable = {self.start_state}
+        pending = [self.start_state]
+        while pending:
+            state = pending.pop()
+            for symbol in self.alphabet:
+                next_state = self.transition_function.get((state, symbol))
+                if next_state is not None and next_state not in reachable:
+                    reachable.add(next_state)
+                    pending.append(next_state)
+        return reachable
+
+    def minimize(self):
+        """
+        Drops unreachable states and merges equivalent ones with Hopcroft's partition
+        refinement. A missing transition is treated as a move into an implicit dead state
+        that is never merged with a real one, so Accepted/Rejected results and which inputs
+        raise "no transition" or "invalid symbol" errors do not change.
+        Each merged state is named after its alphabetically first member.
+        Returns (dfa, mapping) where mapping[new_state] lists the original states it replaces.
+        """
+        dead = None
+        alphabet = sorted(self.alphabet)
+        states = self.reachable_states()
+
+        # inverse[symbol][state] = states moving into state on symbol
+        inverse = {symbol: {} for symbol in alphabet}
+        for state in states:
+            for symbol in alphabet:
+                target = self.transition_function.get((state, symbol), dead)
+                inverse[symbol].setdefault(target, []).append(state)
+        for symbol in alphabet:
+            inverse[symbol].setdefault(dead, []).append(dead)
+
+        initial = [states & self.accept_states, states - self.accept_states, {dead}]
+        blocks = [block for block in initial if block]
+        block_of = {}
+        for i, block in enumerate(blocks):
+            for state in block:
+                block_of[state] = i
+        largest = max(range(len(blocks)), key=lambda i: len(blocks[i]))
+        waiting = {i for i in range(len(blocks)) if i != largest}
+
+        while waiting:
+            splitter = list(blocks[waiting.pop()])
+            for symbol in alphabet:
+                predecessors = inverse[symbol]
+                touched = {}
+                for state in splitter:
+                    for predecessor in predecessors.get(state, ()):
+                        touched.setdefault(block_of[predecessor], set()).add(predecessor)
+                for i, inside in touched.items():
+                    if len(inside) == len(blocks[i]):
+                        continue
+                    blocks[i] -= inside
+                    blocks.append(inside)
+                    new = len(blocks) - 1
+                    for state in inside:
+                        block_of[state] = new
+                    if i in waiting or len(inside) <= len(blocks[i]):
+                        waiting.add(new)
+                    else:
+                        waiting.add(i)
+
+        mapping = {}
+        name_of = {}
+        for block in blocks:
+            if dead in block:
                 continue
+            members = sorted(block)
+            mapping[members[0]] = members
+            for state in members:
+                name_of[state] = members[0]
+
+        transitions = {}
+        for name, members in mapping.items():
+            for symbol in alphabet:
+                target = self.transition_function.get((members[0], symbol))
+                if target is not None:
+                    transitions[(name, symbol)] = name_of[target]
+        accept = [name for name in mapping if name in self.accept_states]
+        minimized = DFA(mapping.keys(), alphabet, transitions, name_of[self.start_state], accept)
+        return minimized, mapping
+
+
+class DFASession:
+    """
+    A DFA run that can be continued: feed() advances it over more symbols (a string or any
+    iterable), in O(1) per symbol, and is_accepting() tells whether everything fed so far is
+    accepted. A symbol that raises is not consumed and the session stays where it was.
+    """
+
+    def __init__(self, dfa):
+        self.dfa = dfa
+        self.state = dfa.start_state
+
+    def feed(self, symbols):
+        if isinstance(symbols, str):
+            symbols = symbols.split()
+        alphabet = self.dfa.alphabet
+        transition_function = self.dfa.transition_function
+        for symbol in symbols:
+            if symbol not in alphabet:
+                raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+            key = (self.state, symbol)
+            if key not in transition_function:
+                raise ValueError(f"[ERROR] No transition from state '{self.state}' on symbol '{symbol}'.")
+            self.state = transition_function[key]
+
+    def is_accepting(self):
+        return self.state in self.dfa.accept_states
+
+    def snapshot(self):
+        return self.state
+
+    def restore(self, snapshot):
+        self.state = snapshot
+
+
+class CompiledDFA:
+    """
+    Integer-indexed form of a DFA: states and symbols are interned as small ints and the
+    transition function becomes a dense (states x alphabet) table. Missing transitions point
+    at a dead-state sentinel, which is its own absorbing row at index len(state_names).
+    """
 
-            if ":" in line:
-                key, value = map(str.strip, line.split(":", 1))
-                current_section = key
-                line = value
-
-            if current_section == "alphabet":
-                alphabet.extend(line.split())
-            elif current_section == "states":
-                states.extend(line.split())
-            elif current_section == "start":
-                start = line.strip()
-            elif current_section == "accept":
-                accept.extend(line.split())
-            elif current_section == "transitions":
-                parts = line.split()
-                if len(parts) == 3:
-                    from_state, symbol, to_state = parts
-                    transitions[(from_state, symbol)] = to_state
+    def __init__(self, dfa):
+        names = set(dfa.states) | {dfa.start_state}
+        for (from_state, _), to_state in dfa.transition_function.items():
+            names.add(from_state)
+            names.add(to_state)
+        self.state_names = sorted(names)
+        self.symbol_names = sorted(dfa.alphabet)
+        self.state_index = {name: i for i, name in enumerate(self.state_names)}
+        self.symbol_index = {name: i for i, name in enumerate(self.symbol_names)}
+
+        self.dead_state = len(self.state_names)
+        self.table = np.full((self.dead_state + 1, len(self.symbol_names)), self.dead_state, dtype=np.int32)
+        for (from_state, symbol), to_state in dfa.transition_function.items():
+            # transitions on symbols outside the alphabet can never fire
+            if symbol in self.symbol_index:
+                self.table[self.state_index[from_state], self.symbol_index[symbol]] = self.state_index[to_state]
+
+        self.accepting = np.zeros(self.dead_state + 1, dtype=bool)
+        for state in dfa.accept_states:
+            if state in self.state_index:
+                self.accepting[self.state_index[state]] = True
+        self.start = self.state_index[dfa.start_state]
+
+        # flat python views of the table for the scalar walk; indexing numpy arrays
+        # element by element from the interpreter is slower than indexing a list
+        self._delta = self.table.ravel().tolist()
+        self._accepting = self.accepting.tolist()
+
+        # Batch table: two extra columns (padding, invalid symbol) and two extra absorbing
+        # rows (dead, invalid). Padding keeps a state where it is so ragged inputs can share
+        # one padded matrix, and the first failure of an input sticks until the end.
+        width = len(self.symbol_names)
+        self.pad_code = width
+        self.invalid_code = width + 1
+        self.invalid_state = self.dead_state + 1
+        batch = np.empty((self.invalid_state + 1, width + 2), dtype=np.int32)
+        batch[:self.dead_state + 1, :width] = self.table
+        batch[:, self.pad_code] = np.arange(self.invalid_state + 1, dtype=np.int32)
+        batch[:, self.invalid_code] = self.invalid_state
+        batch[self.dead_state, :] = self.dead_state
+        batch[self.invalid_state, :] = self.invalid_state
+        self._batch_table = batch
+        self._batch_accepting = np.append(self.accepting, False)
+
+    def __getstate__(self):
+        # the list views are rebuilt from the tables, no need to pickle them twice
+        state = self.__dict__.copy()
+        del state["_delta"], state["_accepting"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._delta = self.table.ravel().tolist()
+        self._accepting = self.accepting.tolist()
+
+    def encode(self, symbols):
+        """Maps a list of symbol names to an int32 array, unknown symbols become -1."""
+        lookup = self.symbol_index.get
+        return np.array([lookup(symbol, -1) for symbol in symbols], dtype=np.int32)
+
+    def accepts_encoded(self, codes, symbols=None):
+        """
+        codes: symbol indices as produced by encode(), or any iterable of them
+        symbols: the original names, only used to report invalid symbols
+        """
+        if isinstance(codes, np.ndarray):
+            codes = codes.tolist()
+        if symbols is None:
+            symbols = codes
+        delta = self._delta
+        width = len(self.symbol_names)
+        dead = self.dead_state
+        state = self.start
+        for code, symbol in zip(codes, symbols):
+            if code < 0:
+                raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+            next_state = delta[state * width + code]
+            if next_state == dead:
+                raise ValueError(f"[ERROR] No transition from state '{self.state_names[state]}' "
+                                 f"on symbol '{self.symbol_names[code]}'.")
+            state = next_state
+        return self._accepting[state]
+
+    def accepts(self, input_string):
+        if isinstance(input_string, str):
+            symbols = input_string.split()
+            return self.accepts_encoded(self.encode(symbols), symbols)
+        # a stream of symbols is encoded as it is walked; tee only buffers one symbol
+        symbols, names = tee(input_string)
+        return self.accepts_encoded(map(self.symbol_index.get, symbols, repeat(-1)), names)
+
+    def encode_many(self, inputs):
+        """
+        inputs: strings (split on whitespace) or lists of symbol names
+        Returns a padded (len(inputs) x longest) int32 matrix and the length of every input.
+        """
+        tokens = []
+        lengths = []
+        for symbols in inputs:
+            if isinstance(symbols, str):
+                symbols = symbols.split()
+            tokens.extend(symbols)
+            lengths.append(len(symbols))
+        codes = np.fromiter(map(self.symbol_index.get, tokens, repeat(self.invalid_code)),
+                            dtype=np.int32, count=len(tokens))
+        lengths = np.array(lengths, dtype=np.int64)
+        longest = int(lengths.max()) if len(lengths) else 0
+        # column-major, so that each position the batch walk steps through is contiguous
+        matrix = np.full((len(lengths), longest), self.pad_code, dtype=np.int32, order="F")
+        matrix[np.arange(longest) < lengths[:, None]] = codes
+        return matrix, lengths
+
+    def accepts_many(self, inputs):
+        """
+        Runs every input at once, one symbol position per step, with a single gather into
+        the transition table per position.
+        Returns (accepted, errors): a boolean array and an int8 array holding OK,
+        INVALID_SYMBOL or NO_TRANSITION for each input. Inputs with an error are not accepted.
+        """
+        matrix, _ = self.encode_many(inputs)
+        return self.accepts_many_encoded(matrix)
+
+    def accepts_many_encoded(self, matrix):
+        """matrix: padded codes as produced by encode_many()"""
+        table = self._batch_table
+        states = np.full(len(matrix), self.start, dtype=np.int32)
+        for column in matrix.T:
+            states = table[states, column]
+
+        errors = np.zeros(len(matrix), dtype=np.int8)
+        errors[states == self.dead_state] = NO_TRANSITION
+        errors[states == self.invalid_state] = INVALID_SYMBOL
+        return self._batch_accepting[states], errors
+
+
+class ProductDFA:
+    """
+    Several DFAs run as one: a product state is the tuple of the component states, and each
+    product state carries the set of ids of the components accepting in it, so a single pass
+    over an input tells which of the DFAs accept it. Product states and their transitions are
+    only built when an input reaches them, in an lfa.bounded.BoundedCache of at most
+    max_states states ("lru" or "flush" eviction).
+
+    dfas: a dict of id -> DFA (or CompiledDFA), or a list, whose ids are then the positions.
+    A component that would raise on an input (invalid symbol, missing transition) simply
+    does not match it.
+    """
+
+    def __init__(self, dfas, max_states=10000, eviction="lru"):
+        # product state -> (frozenset of matching ids, {symbol: next product state})
+        self.cache = BoundedCache(max_states, eviction)
+        if not isinstance(dfas, dict):
+            dfas = dict(enumerate(dfas))
+        self.ids = list(dfas)
+        self.machines = [dfa.compile() if isinstance(dfa, DFA) else dfa for dfa in dfas.values()]
+        self.start = tuple(machine.start for machine in self.machines)
+        # every component failed: nothing can match any more
+        self.dead = tuple(machine.dead_state for machine in self.machines)
+
+    def _entry(self, state):
+        entry = self.cache.get(state)
+        if entry is not None:
+            return entry
+        matches = frozenset(machine_id for machine_id, machine, component in zip(self.ids, self.machines, state)
+                            if machine._accepting[component])
+        return self.cache.add(state, (matches, {}))
+
+    def _step(self, state, symbol):
+        next_state = []
+        for machine, component in zip(self.machines, state):
+            code = machine.symbol_index.get(symbol)
+            if code is None:
+                next_state.append(machine.dead_state)
+            else:
+                next_state.append(machine._delta[component * len(machine.symbol_names) + code])
+        return tuple(next_state)
+
+    def matches(self, input_string):
+        """
+        input_string: a string of whitespace separated symbols, or any iterable of symbols,
+        which is read only until no component can match any more
+        Returns the frozenset of ids of the DFAs that accept the input.
+        """
+        symbols = input_string.split() if isinstance(input_string, str) else input_string
+        state = self.start
+        matches, row = self._entry(state)
+        dead = self.dead
+        for symbol in symbols:
+            if state == dead:
+                break
+            next_state = row.get(symbol)
+            if next_state is None:
+                next_state = row[symbol] = self._step(state, symbol)
+            state = next_state
+            matches, row = self._entry(state)
+        return matches
+
+
+DFA_CONFIG = ConfigSchema(
+    "DFA", lists=("states", "alphabet", "accept"), values=("start",), transition_fields=(3, 3))
+
+
+def parse_dfa_config(filename):
+    transitions = {}
+
+    def add_transition(parts, line_number):
+        from_state, symbol, to_state = parts
+        transitions[(from_state, symbol)] = to_state
+
+    sections = read_config(filename, DFA_CONFIG, add_transition)
+    alphabet = sections["alphabet"]
+    states = sections["states"]
+    start = sections["start"]
+    accept = sections["accept"]
 
     if not (alphabet and states and start and accept and transitions):
         raise ValueError("One or more DFA components are missing in the config.")
@@ -64,20 +419,40 @@ def parse_dfa_config(filename):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the DFA from dfa_config.txt on input.txt.")
+    parser.add_argument("--minimize", action="store_true", help="minimize the DFA after loading it")
+    parser.add_argument("--stream", action="store_true",
+                        help="read input.txt lazily in chunks instead of loading it whole")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="characters read at a time with --stream")
+    args = parser.parse_args()
+
     try:
         dfa = parse_dfa_config("dfa_config.txt")
     except Exception as e:
         print("[FATAL ERROR] Failed to build DFA:", e)
         exit(1)
 
+    if args.minimize:
+        original_size = len(dfa.states)
+        dfa, mapping = dfa.minimize()
+        print(f"[INFO] Minimized DFA from {original_size} to {len(dfa.states)} states.")
+        for name, members in mapping.items():
+            if len(members) > 1:
+                print(f"[INFO] State '{name}' replaces {members}")
+
     try:
-        with open("input.txt", "r") as f:
-            input_str = f.read().strip()
+        if args.stream:
+            input_str = iter_symbols("input.txt", args.chunk_size)
+        else:
+            with open("input.txt", "r") as f:
+                input_str = f.read().strip()
     except FileNotFoundError:
         print("[FATAL ERROR] 'input.txt' not found.")
         exit(1)
 
-    print(f"[INFO] Input string: '{input_str}'")
+    if not args.stream:
+        print(f"[INFO] Input string: '{input_str}'")
     try:
         if dfa.accepts(input_str):
             print("Accepted")
@@ -1,75 +1,348 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.bounded import BoundedCache
+from lfa.machines import load_module
+from lfa.config import ConfigSchema, read_config
+from lfa.stream import DEFAULT_CHUNK_SIZE, iter_symbols
+
+# Transition symbol of an epsilon move, as in the PDA
+EPSILON = 'e'
+
+
+def _epsilon_closures(epsilon_moves):
+    """
+    epsilon_moves: dict state -> set of states one epsilon move away
+    Returns a dict state -> frozenset of the states reachable by epsilon moves (itself
+    included), for every state with epsilon moves. The epsilon graph is condensed into its
+    strongly connected components (Tarjan), which come out successors first, so every
+    component's closure is its members plus the closures of the components it reaches,
+    shared by all of its members.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    closures = {}
+    for root in epsilon_moves:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(epsilon_moves[root]))]
+        while work:
+            state, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(epsilon_moves.get(target, ()))))
+                    break
+                if target in on_stack:
+                    low[state] = min(low[state], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[state])
+                if low[state] == index[state]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == state:
+                            break
+                    closure = set(members)
+                    for member in members:
+                        for target in epsilon_moves.get(member, ()):
+                            if target not in closure:
+                                closure |= closures[target]
+                    closure = frozenset(closure)
+                    for member in members:
+                        closures[member] = closure
+    return closures
+
+
 class NFA:
     def __init__(self, states, alphabet, transition_function, start_state, accept_states):
         self.states = set(states)
         self.alphabet = set(alphabet)
-        # transition_function: dict with keys (state, symbol), values = set of next states
+        # transition_function: dict with keys (state, symbol), values = set of next states;
+        # symbol EPSILON marks epsilon moves
         self.transition_function = transition_function
         self.start_state = start_state
         self.accept_states = set(accept_states)
 
-    def accepts(self, input_symbols):
+        # Epsilon moves are resolved once here: the active states are always kept closed
+        # under them, so the start set is the closure of the start state and step_function
+        # maps (state, symbol) to the closure of its targets. Without epsilon moves these are
+        # {start_state} and transition_function itself.
+        epsilon_moves = {from_state: to_states for (from_state, symbol), to_states in transition_function.items()
+                         if symbol == EPSILON}
+        if epsilon_moves:
+            closures = _epsilon_closures(epsilon_moves)
+            self.start_states = set(closures.get(start_state, {start_state}))
+            self.step_function = {}
+            for (from_state, symbol), to_states in transition_function.items():
+                if symbol == EPSILON:
+                    continue
+                closed = set()
+                for to_state in to_states:
+                    closed |= closures.get(to_state, {to_state})
+                self.step_function[(from_state, symbol)] = closed
+        else:
+            self.start_states = {start_state}
+            self.step_function = transition_function
+
+    def accepts(self, input_symbols, observer=None):
         """
-        input_symbols: list of strings, each string is a symbol from the alphabet
+        input_symbols: list (or any iterable, e.g. iter_symbols(filename)) of strings, each
+        string is a symbol from the alphabet; an iterable is only consumed up to the first error
+        observer: an lfa.observe.Observer told about every active state and transition
         """
-        current_states = {self.start_state}  # start with set of states
+        if observer is not None:
+            return self._accepts_observed(input_symbols, observer)
+        current_states = self.start_states  # start with set of states
         for symbol in input_symbols:
             if symbol not in self.alphabet:
                 raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
             next_states = set()
             for state in current_states:
                 key = (state, symbol)
-                if key in self.transition_function:
-                    next_states.update(self.transition_function[key])
+                if key in self.step_function:
+                    next_states.update(self.step_function[key])
             if not next_states:
                 raise ValueError(f"[ERROR] No transition from states {current_states} on symbol '{symbol}'.")
             current_states = next_states
         # accept if ANY of current_states is an accept state
         return any(state in self.accept_states for state in current_states)
 
+    def _accepts_observed(self, input_symbols, observer):
+        current_states = self.start_states
+        observer.begin()
+        for state in current_states:
+            observer.visit(state)
+        for symbol in input_symbols:
+            if symbol not in self.alphabet:
+                raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+            next_states = set()
+            for state in current_states:
+                key = (state, symbol)
+                if key in self.step_function:
+                    next_states.update(self.step_function[key])
+                    observer.transition(key, self.step_function[key])
+            if not next_states:
+                raise ValueError(f"[ERROR] No transition from states {current_states} on symbol '{symbol}'.")
+            current_states = next_states
+            for state in current_states:
+                observer.visit(state)
+        return any(state in self.accept_states for state in current_states)
+
+    def compile(self):
+        return BitsetNFA(self)
 
-def parse_nfa_config(filename):
-    alphabet = []
-    states = []
-    start = None
-    accept = []
-    transitions = {}
+    def determinize(self):
+        return self.compile().determinize()
+
+    def lazy(self, max_states=10000, eviction="lru"):
+        return LazyDFA(self, max_states, eviction)
+
+    def start(self):
+        return self.compile().start()
 
-    current_section = None
-    with open(filename, "r") as file:
-        for raw_line in file:
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "#" in line:
-                line = line.split("#")[0].strip()
 
-            if line.endswith(":"):
-                current_section = line[:-1].strip()
+class BitsetNFA:
+    """
+    NFA simulation over bitmasks: state i is bit i of a python int, and every
+    (state, symbol) pair has a precomputed successor mask, so a step is one OR per
+    active state instead of building a new set. The masks come from the NFA's
+    step_function, so epsilon moves are already folded in.
+    """
+
+    def __init__(self, nfa):
+        names = set(nfa.states) | {nfa.start_state}
+        for (from_state, _), to_states in nfa.transition_function.items():
+            names.add(from_state)
+            names.update(to_states)
+        self.state_names = sorted(names)
+        self.state_index = {name: i for i, name in enumerate(self.state_names)}
+        self.alphabet = set(nfa.alphabet)
+
+        # successors[symbol][i] = mask of the states reachable from state i on symbol
+        self.successors = {symbol: [0] * len(self.state_names) for symbol in self.alphabet}
+        for (from_state, symbol), to_states in nfa.step_function.items():
+            if symbol not in self.successors:
                 continue
+            mask = 0
+            for to_state in to_states:
+                mask |= 1 << self.state_index[to_state]
+            self.successors[symbol][self.state_index[from_state]] |= mask
+
+        self.start_mask = 0
+        for state in nfa.start_states:
+            self.start_mask |= 1 << self.state_index[state]
+        self.accept_mask = 0
+        for state in nfa.accept_states:
+            if state in self.state_index:
+                self.accept_mask |= 1 << self.state_index[state]
+
+    def to_states(self, mask):
+        return {self.state_names[i] for i in range(len(self.state_names)) if mask >> i & 1}
+
+    def step(self, mask, symbol):
+        successors = self.successors[symbol]
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= successors[low.bit_length() - 1]
+            mask ^= low
+        return next_mask
+
+    def accepts(self, input_symbols):
+        """
+        input_symbols: list of strings, each string is a symbol from the alphabet
+        """
+        session = self.start()
+        session.feed(input_symbols)
+        return session.is_accepting()
+
+    def start(self):
+        return NFASession(self)
+
+    def subset_name(self, mask):
+        return "{" + ",".join(sorted(self.to_states(mask))) + "}"
+
+    def determinize(self):
+        """
+        Subset construction over the states reachable from the start set. Empty subsets are
+        left out, so a missing DFA transition raises where the NFA would have raised.
+        """
+        alphabet = sorted(self.alphabet)
+        names = {self.start_mask: self.subset_name(self.start_mask)}
+        transitions = {}
+        pending = [self.start_mask]
+        while pending:
+            mask = pending.pop()
+            for symbol in alphabet:
+                next_mask = self.step(mask, symbol)
+                if not next_mask:
+                    continue
+                if next_mask not in names:
+                    names[next_mask] = self.subset_name(next_mask)
+                    pending.append(next_mask)
+                transitions[(names[mask], symbol)] = names[next_mask]
+
+        accept = [name for mask, name in names.items() if mask & self.accept_mask]
+        return load_module("dfa").DFA(names.values(), alphabet, transitions, names[self.start_mask], accept)
+
+
+class NFASession:
+    """
+    A BitsetNFA run that can be continued: feed() advances the set of active states over more
+    symbols (a list or any iterable), and is_accepting() tells whether everything fed so far
+    is accepted. A symbol that raises is not consumed and the session stays where it was.
+    """
+
+    def __init__(self, bitset):
+        self.bitset = bitset
+        self.mask = bitset.start_mask
+
+    def feed(self, input_symbols):
+        successors_by_symbol = self.bitset.successors
+        current = self.mask
+        for symbol in input_symbols:
+            successors = successors_by_symbol.get(symbol)
+            if successors is None:
+                self.mask = current
+                raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+            mask = current
+            next_mask = 0
+            while mask:
+                low = mask & -mask
+                next_mask |= successors[low.bit_length() - 1]
+                mask ^= low
+            if not next_mask:
+                self.mask = current
+                raise ValueError(f"[ERROR] No transition from states {self.bitset.to_states(current)} "
+                                 f"on symbol '{symbol}'.")
+            current = next_mask
+        self.mask = current
+
+    def is_accepting(self):
+        return bool(self.mask & self.bitset.accept_mask)
+
+    def states(self):
+        return self.bitset.to_states(self.mask)
+
+    def snapshot(self):
+        return self.mask
+
+    def restore(self, snapshot):
+        self.mask = snapshot
+
 
-            if ":" in line:
-                key, value = map(str.strip, line.split(":", 1))
-                current_section = key
-                line = value
-
-            if current_section == "alphabet":
-                # Instead of splitting by whitespace, split by commas or spaces?
-                # Assuming symbols are separated by spaces still for config
-                alphabet.extend(line.split())
-            elif current_section == "states":
-                states.extend(line.split())
-            elif current_section == "start":
-                start = line.strip()
-            elif current_section == "accept":
-                accept.extend(line.split())
-            elif current_section == "transitions":
-                parts = line.split()
-                if len(parts) == 3:
-                    from_state, symbol, to_state = parts
-                    key = (from_state, symbol)
-                    if key not in transitions:
-                        transitions[key] = set()
-                    transitions[key].add(to_state)
+class LazyDFA:
+    """
+    Subset construction done on the fly: a DFA state (a subset mask) and its outgoing
+    transitions are only built when an input reaches them, and are kept in an
+    lfa.bounded.BoundedCache of at most max_states states ("lru" or "flush" eviction).
+    """
+
+    def __init__(self, nfa, max_states=10000, eviction="lru"):
+        # subset mask -> {symbol: next subset mask}
+        self.cache = BoundedCache(max_states, eviction)
+        self.bitset = nfa if isinstance(nfa, BitsetNFA) else nfa.compile()
+
+    def _row(self, mask):
+        row = self.cache.get(mask)
+        if row is None:
+            row = self.cache.add(mask, {})
+        return row
+
+    def accepts(self, input_symbols):
+        """
+        input_symbols: list of strings, each string is a symbol from the alphabet
+        """
+        bitset = self.bitset
+        current = bitset.start_mask
+        row = self._row(current)
+        for symbol in input_symbols:
+            next_mask = row.get(symbol)
+            if next_mask is None:
+                if symbol not in bitset.alphabet:
+                    raise ValueError(f"[ERROR] Invalid symbol '{symbol}' in input.")
+                next_mask = row[symbol] = bitset.step(current, symbol)
+            if not next_mask:
+                raise ValueError(f"[ERROR] No transition from states {bitset.to_states(current)} on symbol '{symbol}'.")
+            current = next_mask
+            row = self._row(current)
+        return bool(current & bitset.accept_mask)
+
+
+NFA_CONFIG = ConfigSchema(
+    "NFA", lists=("states", "alphabet", "accept"), values=("start",), transition_fields=(3, 3))
+
+
+def parse_nfa_config(filename):
+    transitions = {}
+
+    def add_transition(parts, line_number):
+        from_state, symbol, to_state = parts
+        key = (from_state, symbol)
+        if key not in transitions:
+            transitions[key] = set()
+        transitions[key].add(to_state)
+
+    sections = read_config(filename, NFA_CONFIG, add_transition)
+    alphabet = sections["alphabet"]
+    states = sections["states"]
+    start = sections["start"]
+    accept = sections["accept"]
 
     if not (alphabet and states and start and accept and transitions):
         raise ValueError("One or more NFA components are missing in the config.")
@@ -78,6 +351,13 @@ def parse_nfa_config(filename):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the NFA from nfa_config.txt on input.txt.")
+    parser.add_argument("--stream", action="store_true",
+                        help="read input.txt lazily in chunks instead of loading it whole")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="characters read at a time with --stream")
+    args = parser.parse_args()
+
     try:
         nfa = parse_nfa_config("nfa_config.txt")
     except Exception as e:
@@ -85,14 +365,18 @@ if __name__ == "__main__":
         exit(1)
 
     try:
-        with open("input.txt", "r") as f:
-            # Split input by whitespace to get list of symbols
-            input_symbols = f.read().strip().split()
+        if args.stream:
+            input_symbols = iter_symbols("input.txt", args.chunk_size)
+        else:
+            with open("input.txt", "r") as f:
+                # Split input by whitespace to get list of symbols
+                input_symbols = f.read().strip().split()
     except FileNotFoundError:
         print("[FATAL ERROR] 'input.txt' not found.")
         exit(1)
 
-    print(f"[INFO] Input symbols: {input_symbols}")
+    if not args.stream:
+        print(f"[INFO] Input symbols: {input_symbols}")
     try:
         if nfa.accepts(input_symbols):
             print("Accepted")
@@ -1,3 +1,67 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.config import ConfigSchema, read_config
+from lfa.stream import DEFAULT_CHUNK_SIZE, iter_symbols
+
+# Outcomes of PDA.search
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+BUDGET_EXCEEDED = "budget exceeded"
+BUDGET_EXCEEDED_MESSAGE = "Search budget exceeded before the input was accepted or rejected."
+
+DEFAULT_MAX_CONFIGS = 1000000
+
+# Marks the bottom of the stack in the saturation engine, so moves on an empty stack
+# (stack_top 'e') can be written as ordinary pushdown rules; never equal to a config symbol
+BOTTOM = ("bottom",)
+
+
+class SharedStacks:
+    """
+    Persistent stacks stored as linked nodes, so a push shares the whole stack below it
+    instead of copying it. Nodes are hash-consed: equal stacks always get the same int id,
+    which makes a configuration (state, index, stack id) cheap to hash and compare.
+    Node 0 is the empty stack.
+    """
+
+    def __init__(self):
+        self.top = [None]
+        self.below = [0]
+        self._nodes = {}
+
+    def push(self, node, symbol):
+        key = (node, symbol)
+        pushed = self._nodes.get(key)
+        if pushed is None:
+            pushed = self._nodes[key] = len(self.top)
+            self.top.append(symbol)
+            self.below.append(node)
+        return pushed
+
+
+def _possible_keys(state, current_sym, stack_top):
+    # the transition keys that apply to a configuration, each once: at the end of the input
+    # (current_sym 'e') or on an empty stack (stack_top 'e') some of the four coincide
+    return dict.fromkeys(((state, current_sym, stack_top), (state, current_sym, 'e'),
+                          (state, 'e', stack_top), (state, 'e', 'e')))
+
+
+def _stack_depth(stacks, node, depth):
+    # depth of a SharedStacks node, memoized in depth; only needed when observing a search
+    path = []
+    while node not in depth:
+        path.append(node)
+        node = stacks.below[node]
+    known = depth[node]
+    for node in reversed(path):
+        known += 1
+        depth[node] = known
+    return known
+
+
 class PDA:
     def __init__(self, states, alphabet, stack_alphabet, transitions, start_state, start_stack_symbol, accept_states):
         self.states = set(states)
@@ -7,8 +71,76 @@ class PDA:
         self.start_state = start_state
         self.start_stack_symbol = start_stack_symbol
         self.accept_states = set(accept_states)
+        # None when the transitions are not deterministic, see _deterministic_moves()
+        self.moves = self._deterministic_moves()
+        self.deterministic = self.moves is not None
+
+    def _deterministic_moves(self):
+        """
+        At most one transition may apply in any configuration: for every state, input symbol
+        (or the end of the input) and stack top (or an empty stack), the keys (state, symbol,
+        top), (state, symbol, 'e'), (state, 'e', top) and (state, 'e', 'e') must hold one
+        distinct transition between them. If so, returns that transition resolved ahead of
+        time, as moves[state][symbol][top] = (next_state, pops, pushed, reads) or None, where
+        symbol and top are 'e' for everything not mentioned in the state's keys; else None.
+        """
+        symbols_of = {}
+        tops_of = {}
+        for state, input_sym, stack_top in self.transitions:
+            symbols_of.setdefault(state, {'e'}).add(input_sym)
+            tops_of.setdefault(state, {'e'}).add(stack_top)
+
+        moves = {}
+        for state in symbols_of:
+            row = moves[state] = {}
+            for input_sym in symbols_of[state]:
+                column = row[input_sym] = {}
+                for stack_top in tops_of[state]:
+                    found = set()
+                    for key in {(state, input_sym, stack_top), (state, input_sym, 'e'),
+                                (state, 'e', stack_top), (state, 'e', 'e')}:
+                        for next_state, stack_push in self.transitions.get(key, ()):
+                            pushed = tuple(sym for sym in reversed(stack_push) if sym != 'e')
+                            found.add((next_state, key[2] != 'e', pushed, key[1] != 'e'))
+                    if len(found) > 1:
+                        return None
+                    column[stack_top] = found.pop() if found else None
+        return moves
+
+    def accepts(self, input_string, engine="auto", max_configs=DEFAULT_MAX_CONFIGS, max_steps=None, observer=None):
+        """
+        engine: "dfs" explores configurations depth first without remembering them,
+        "deterministic" follows the single configuration of a deterministic PDA in linear time,
+        "auto" picks "deterministic" when the PDA is and "dfs" otherwise,
+        "memo" runs search() and reports a budget overrun as an error,
+        "saturation" runs saturate(), which is polynomial in the input length
+        max_steps: if given, the number of configurations "memo" and "deterministic" may
+        expand before reporting a budget overrun
+        observer: an lfa.observe.Observer told about every configuration explored and
+        transition taken by the "dfs" and "memo" engines ("auto" then picks "dfs")
+        input_string may also be any iterable of symbols, which runs accepts_stream() unless
+        another engine, max_steps or an observer is asked for; the symbols are then read
+        into a string first, since the other engines need the whole input
+        """
+        if not isinstance(input_string, str):
+            if engine == "auto" and max_steps is None and observer is None:
+                return self.accepts_stream(input_string, max_configs)
+            input_string = " ".join(input_string)
+        if engine == "auto":
+            engine = "deterministic" if self.deterministic and observer is None else "dfs"
+        if engine == "saturation":
+            return self.saturate(input_string)
+        if engine == "memo":
+            outcome = self.search(input_string, max_configs, max_steps, observer)
+            if outcome == BUDGET_EXCEEDED:
+                print(f"[ERROR] {BUDGET_EXCEEDED_MESSAGE}")
+            return outcome == ACCEPTED
+        if engine not in ("dfs", "deterministic"):
+            raise ValueError(f"Unknown PDA engine '{engine}', expected 'auto', 'dfs', 'deterministic', "
+                             f"'memo' or 'saturation'.")
+        if engine == "deterministic" and not self.deterministic:
+            raise ValueError("The 'deterministic' engine needs a deterministic PDA.")
 
-    def accepts(self, input_string):
         # Split input string by spaces, to get each symbol as a string
         input_symbols = input_string.strip().split()
 
@@ -18,6 +150,11 @@ class PDA:
                 print(f"[ERROR] Invalid symbol '{symbol}' in input.")
                 return False
 
+        if engine == "deterministic":
+            return self._accepts_deterministic(input_symbols, max_steps)
+        if observer is not None:
+            return self._accepts_observed(input_symbols, observer)
+
         # Configurations = list of tuples: (state, input_index, stack)
         configs = [(self.start_state, 0, [self.start_stack_symbol])]
 
@@ -56,76 +193,423 @@ class PDA:
 
         return False
 
+    def _accepts_deterministic(self, input_symbols, max_steps=None):
+        """
+        The "deterministic" engine: one configuration, with the stack as a list changed in
+        place. The only way for it to run forever is a loop of epsilon moves, which is caught
+        by remembering the (state, top) of every epsilon move at the current input position
+        together with the index of its top cell. A mark stays valid while no configuration has
+        had a stack short enough to show the cells under that one; seeing the same pair again
+        while its mark is valid means the run never looked under the top since and will repeat
+        itself forever without accepting (the "dfs" engine never returns there). The indices
+        of valid marks never decrease, so they are dropped from the end as the stack shrinks.
+        """
+        moves = self.moves
+        accept_states = self.accept_states
+        bottom = self.start_stack_symbol
+        length = len(input_symbols)
+        state = self.start_state
+        stack = [bottom]
+        index = 0
+        seen = {}
+        marks = []
+        # counts down to 0 when max_steps is given, never reaches it otherwise
+        remaining = -1 if max_steps is None else max_steps
 
-def parse_pda_config(filename):
-    sections = {
-        "states": [],
-        "alphabet": [],
-        "stack_alphabet": [],
-        "start": None,
-        "start_stack": None,
-        "accept": [],
-        "transitions": []
-    }
-
-    with open(filename, "r") as f:
-        lines = []
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "#" in line:
-                line = line.split("#")[0].strip()
-            if line:
-                lines.append(line)
-
-    current_section = None
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if line.endswith(":"):
-            current_section = line[:-1].strip()
-            i += 1
-            section_lines = []
-            while i < len(lines) and not lines[i].endswith(":"):
-                section_lines.append(lines[i])
-                i += 1
-
-            if current_section in ["states", "alphabet", "stack_alphabet", "accept"]:
-                # Flatten and split by whitespace, so multi-word symbols can be supported naturally
-                all_items = []
-                for l in section_lines:
-                    all_items.extend(l.split())
-                sections[current_section] = all_items
-
-            elif current_section in ["start", "start_stack"]:
-                if section_lines:
-                    sections[current_section] = section_lines[0]
-
-            elif current_section == "transitions":
-                for tline in section_lines:
-                    parts = tline.split()
-                    if len(parts) >= 4:
-                        from_state = parts[0]
-                        input_sym = parts[1]
-                        stack_top = parts[2]
-                        to_state = parts[3]
-                        stack_push = parts[4:] if len(parts) > 4 else ['e']
-                        sections["transitions"].append((from_state, input_sym, stack_top, to_state, stack_push))
+        while True:
+            if index == length and state in accept_states and len(stack) == 1 and stack[0] == bottom:
+                return True
+            if remaining == 0:
+                print(f"[ERROR] {BUDGET_EXCEEDED_MESSAGE}")
+                return False
+            remaining -= 1
+            row = moves.get(state)
+            if row is None:
+                return False
+            current_sym = input_symbols[index] if index < length else 'e'
+            column = row.get(current_sym) or row['e']
+            stack_top = stack[-1] if stack else 'e'
+            move = column.get(stack_top, column['e'])
+            if move is None:
+                return False
+
+            next_state, pops, pushed, reads = move
+            if reads:
+                index += 1
+                if marks:
+                    seen.clear()
+                    marks.clear()
             else:
-                # unknown section, ignore
-                pass
-        else:
-            i += 1
+                key = (state, stack_top)
+                if key in seen:
+                    return False
+                seen[key] = len(stack) - 1
+                marks.append((len(stack) - 1, key))
+            state = next_state
+            if pops:
+                stack.pop()
+                stack.extend(pushed)
+                # the cell at index len(stack) or above is gone, and what was under it shows
+                height = len(stack)
+                while marks and marks[-1][0] >= height:
+                    del seen[marks.pop()[1]]
+            else:
+                stack.extend(pushed)
+
+    def _accepts_observed(self, input_symbols, observer):
+        configs = [(self.start_state, 0, [self.start_stack_symbol])]
+        observer.begin()
+        while configs:
+            state, index, stack = configs.pop()
+            observer.visit(state)
+            observer.configuration(len(stack))
+            if index == len(input_symbols) and state in self.accept_states and stack == [self.start_stack_symbol]:
+                return True
+
+            current_sym = input_symbols[index] if index < len(input_symbols) else 'e'
+            stack_top = stack[-1] if stack else 'e'
+            for key in _possible_keys(state, current_sym, stack_top):
+                for (next_state, stack_push) in self.transitions.get(key, ()):
+                    observer.transition(key, next_state)
+                    new_stack = stack.copy()
+                    if key[2] != 'e' and new_stack:
+                        new_stack.pop()
+                    for sym in reversed(stack_push):
+                        if sym != 'e':
+                            new_stack.append(sym)
+                    new_index = index + 1 if key[1] != 'e' else index
+                    configs.append((next_state, new_index, new_stack))
+
+        return False
+
+    def search(self, input_string, max_configs=DEFAULT_MAX_CONFIGS, max_steps=None, observer=None):
+        """
+        Depth first search like the "dfs" engine, but stacks are SharedStacks nodes and every
+        configuration is explored at most once, so epsilon cycles cannot loop forever.
+        max_configs caps the number of distinct configurations seen and max_steps (if given)
+        the number of configurations expanded. An observer is told about every configuration
+        expanded (with its stack depth) and every transition taken.
+        Returns ACCEPTED, REJECTED or BUDGET_EXCEEDED.
+        """
+        input_symbols = input_string.strip().split()
+        for symbol in input_symbols:
+            if symbol not in self.alphabet:
+                print(f"[ERROR] Invalid symbol '{symbol}' in input.")
+                return REJECTED
+
+        transitions = self.transitions
+        stacks = SharedStacks()
+        depth = {0: 0}
+        tops = stacks.top
+        below = stacks.below
+        push = stacks.push
+        final_stack = push(0, self.start_stack_symbol)
+        end = len(input_symbols)
+
+        start = (self.start_state, 0, final_stack)
+        visited = {start}
+        configs = [start]
+        if observer is not None:
+            observer.begin()
+        steps = 0
+        while configs:
+            state, index, stack = configs.pop()
+            if index == end and stack == final_stack and state in self.accept_states:
+                return ACCEPTED
+            steps += 1
+            if max_steps is not None and steps > max_steps:
+                return BUDGET_EXCEEDED
+            if observer is not None:
+                # one check per expanded configuration, which costs little next to expanding it
+                observer.visit(state)
+                observer.configuration(_stack_depth(stacks, stack, depth))
 
+            current_sym = input_symbols[index] if index < end else 'e'
+            stack_top = tops[stack] if stack else 'e'
+            for key in _possible_keys(state, current_sym, stack_top):
+                moves = transitions.get(key)
+                if not moves:
+                    continue
+                base = below[stack] if key[2] != 'e' and stack else stack
+                new_index = index + 1 if key[1] != 'e' else index
+                for next_state, stack_push in moves:
+                    new_stack = base
+                    for sym in reversed(stack_push):
+                        if sym != 'e':
+                            new_stack = push(new_stack, sym)
+                    config = (next_state, new_index, new_stack)
+                    if observer is not None:
+                        observer.transition(key, next_state)
+                    if config not in visited:
+                        if len(visited) >= max_configs:
+                            return BUDGET_EXCEEDED
+                        visited.add(config)
+                        configs.append(config)
+
+        return REJECTED
+
+    def _rules(self, input_symbols, control, top):
+        """
+        Pushdown rules for the saturation engine: the moves from control with top on the
+        stack, as (next control, word) pairs where word replaces top, first symbol on top.
+        Controls are ("at", state, input index) or ("push", control, symbols), an intermediate
+        control still owing symbols to push, which keeps every word at most two symbols long.
+        """
+        if control[0] == "push":
+            _, target, owed = control
+            next_control = target if len(owed) == 1 else ("push", target, owed[:-1])
+            return [(next_control, (owed[-1], top))]
+
+        _, state, index = control
+        current_syms = [input_symbols[index], 'e'] if index < len(input_symbols) else ['e']
+        stack_tops = [top, 'e'] if top is not BOTTOM else ['e']
+        rules = []
+        for current_sym in current_syms:
+            new_index = index + 1 if current_sym != 'e' else index
+            for stack_top in stack_tops:
+                for next_state, stack_push in self.transitions.get((state, current_sym, stack_top), ()):
+                    word = tuple(sym for sym in stack_push if sym != 'e')
+                    # a move keyed on 'e' leaves the top in place
+                    if stack_top == 'e':
+                        word += (top,)
+                    next_control = ("at", next_state, new_index)
+                    if len(word) > 2:
+                        next_control = ("push", next_control, word[:-2])
+                        word = word[-2:]
+                    rules.append((next_control, word))
+        return rules
+
+    def saturate(self, input_string):
+        """
+        Decides acceptance in time polynomial in the input length, with the post* saturation
+        algorithm for pushdown systems (Schwoon, "Model-Checking Pushdown Systems", 2002).
+        A configuration is a control ("at", state, input index) plus the stack over BOTTOM.
+        Starting from the automaton that accepts only the initial configuration, transitions
+        are added until it accepts every reachable configuration; the input is accepted if
+        that includes an accept state at the end of the input with the start stack symbol alone
+        on the stack. Gives the same answers as the "dfs" engine wherever that one terminates.
+        """
+        input_symbols = input_string.strip().split()
+        for symbol in input_symbols:
+            if symbol not in self.alphabet:
+                print(f"[ERROR] Invalid symbol '{symbol}' in input.")
+                return False
+
+        rules_cache = {}
+        start_stack_state = ("stack", 1)
+        final_state = ("stack", 0)
+        # rel holds the automaton transitions (source, symbol or None for epsilon, target),
+        # indexed by source in outgoing; epsilon_into[mid] lists controls with an epsilon move to mid
+        rel = {(start_stack_state, BOTTOM, final_state)}
+        outgoing = {start_stack_state: [(BOTTOM, final_state)]}
+        epsilon_into = {}
+        pending = [(("at", self.start_state, 0), self.start_stack_symbol, start_stack_state)]
+
+        while pending:
+            transition = pending.pop()
+            if transition in rel:
+                continue
+            rel.add(transition)
+            control, symbol, target = transition
+            outgoing.setdefault(control, []).append((symbol, target))
+
+            if symbol is None:
+                if target[0] == "mid":
+                    epsilon_into.setdefault(target, []).append(control)
+                for next_symbol, next_target in outgoing.get(target, ()):
+                    pending.append((control, next_symbol, next_target))
+                continue
+
+            key = (control, symbol)
+            if key not in rules_cache:
+                rules_cache[key] = self._rules(input_symbols, control, symbol)
+            for next_control, word in rules_cache[key]:
+                if not word:
+                    pending.append((next_control, None, target))
+                elif len(word) == 1:
+                    pending.append((next_control, word[0], target))
+                else:
+                    mid = ("mid", next_control, word[0])
+                    pending.append((next_control, word[0], mid))
+                    below = (mid, word[1], target)
+                    if below not in rel:
+                        rel.add(below)
+                        outgoing.setdefault(mid, []).append((word[1], target))
+                        for epsilon_control in epsilon_into.get(mid, ()):
+                            pending.append((epsilon_control, word[1], target))
+
+        for state in self.accept_states:
+            control = ("at", state, len(input_symbols))
+            sources = [control] + [target for symbol, target in outgoing.get(control, ()) if symbol is None]
+            for source in sources:
+                for symbol, middle in outgoing.get(source, ()):
+                    if symbol != self.start_stack_symbol:
+                        continue
+                    if (middle, BOTTOM, final_state) in rel:
+                        return True
+        return False
+
+    def accepts_stream(self, input_symbols, max_configs=DEFAULT_MAX_CONFIGS):
+        """
+        Same result as accepts(), but input_symbols can be any iterable of symbols
+        (e.g. iter_symbols(filename)) and is read one symbol at a time. Instead of a DFS over
+        input positions, this keeps the set of (state, stack) configurations reachable after
+        each prefix (see PDASession), and stops reading as soon as that set becomes empty.
+        """
+        session = self.start(max_configs)
+        session.feed(input_symbols)
+        return session.is_accepting()
+
+    def start(self, max_configs=DEFAULT_MAX_CONFIGS):
+        return PDASession(self, max_configs)
+
+
+class PDASession:
+    """
+    A PDA run that can be continued: configs is the frontier of (state, stack) configurations
+    reached by the symbols fed so far, before any epsilon moves after the last of them, with
+    the stacks as SharedStacks nodes. feed() advances it over more symbols and is_accepting()
+    tells whether the input so far is accepted.
+
+    Epsilon moves are followed for at most max_configs configurations per step, like search();
+    an overrun is reported as an error and rejects the input, since a loop of epsilon moves
+    that keeps pushing would otherwise run forever. is_accepting() stops at the first
+    accepting configuration, so such a loop only matters when the input goes on. Like
+    accepts(), an invalid symbol is reported with print and rejects the input; after that,
+    or once no configuration is left, feed() ignores further symbols.
+    """
+
+    # the node table only grows, so it is rebuilt from the live stacks once it has doubled
+    MIN_COMPACT_NODES = 1 << 16
+
+    def __init__(self, pda, max_configs=DEFAULT_MAX_CONFIGS):
+        self.pda = pda
+        self.max_configs = max_configs
+        self.stacks = SharedStacks()
+        self.bottom = self.stacks.push(0, pda.start_stack_symbol)
+        self.configs = {(pda.start_state, self.bottom)}
+        self.exceeded = False
+        self._compact_at = self.MIN_COMPACT_NODES
+
+    def _moves(self, state, node, symbol):
+        # the configurations one move on symbol ('e' for an epsilon move) away from (state, node)
+        stacks = self.stacks
+        stack_top = stacks.top[node] if node else 'e'
+        for key in ((state, symbol, stack_top), (state, symbol, 'e')):
+            for next_state, stack_push in self.pda.transitions.get(key, ()):
+                new_node = stacks.below[node] if key[2] != 'e' and node else node
+                for sym in reversed(stack_push):
+                    if sym != 'e':
+                        new_node = stacks.push(new_node, sym)
+                yield next_state, new_node
+
+    def _closure(self):
+        # yields the configurations reachable from configs by epsilon moves, each once, and
+        # stops with exceeded set once there are more than max_configs of them
+        seen = set(self.configs)
+        pending = list(seen)
+        while pending:
+            config = pending.pop()
+            yield config
+            for next_config in self._moves(*config, 'e'):
+                if next_config not in seen:
+                    if len(seen) >= self.max_configs:
+                        self.exceeded = True
+                        return
+                    seen.add(next_config)
+                    pending.append(next_config)
+
+    def _reject_exceeded(self):
+        print(f"[ERROR] {BUDGET_EXCEEDED_MESSAGE}")
+        self.configs = set()
+
+    def feed(self, input_symbols):
+        pda = self.pda
+        for symbol in input_symbols:
+            if not self.configs:
+                return
+            if symbol not in pda.alphabet:
+                print(f"[ERROR] Invalid symbol '{symbol}' in input.")
+                self.configs = set()
+                return
+            next_configs = set()
+            for state, node in self._closure():
+                next_configs.update(self._moves(state, node, symbol))
+            if self.exceeded:
+                self._reject_exceeded()
+                return
+            self.configs = next_configs
+            if len(self.stacks.top) > self._compact_at:
+                self._compact()
+
+    def is_accepting(self):
+        accept_states = self.pda.accept_states
+        for state, node in self._closure():
+            if node == self.bottom and state in accept_states:
+                return True
+        if self.exceeded and self.configs:
+            self._reject_exceeded()
+        return False
+
+    def _compact(self):
+        old = self.stacks
+        self.stacks = SharedStacks()
+        translated = {0: 0}
+
+        def translate(node):
+            path = []
+            while node not in translated:
+                path.append(node)
+                node = old.below[node]
+            new_node = translated[node]
+            for old_node in reversed(path):
+                new_node = translated[old_node] = self.stacks.push(new_node, old.top[old_node])
+            return new_node
+
+        self.bottom = translate(self.bottom)
+        self.configs = {(state, translate(node)) for state, node in self.configs}
+        self._compact_at = max(self.MIN_COMPACT_NODES, 2 * len(self.stacks.top))
+
+    def snapshot(self):
+        # stacks as tuples (top last), which stay valid when the node table is compacted
+        snapshot = set()
+        for state, node in self.configs:
+            stack = []
+            while node:
+                stack.append(self.stacks.top[node])
+                node = self.stacks.below[node]
+            snapshot.add((state, tuple(reversed(stack))))
+        return frozenset(snapshot)
+
+    def restore(self, snapshot):
+        self.exceeded = False
+        self.configs = set()
+        for state, stack in snapshot:
+            node = 0
+            for sym in stack:
+                node = self.stacks.push(node, sym)
+            self.configs.add((state, node))
+
+
+PDA_CONFIG = ConfigSchema(
+    "PDA", lists=("states", "alphabet", "stack_alphabet", "accept"), values=("start", "start_stack"),
+    transition_fields=(4, None))
+
+
+def parse_pda_config(filename):
     # Build transitions dict with keys as tuples (state, input_symbol, stack_top)
     transitions = {}
-    for from_state, input_sym, stack_top, to_state, stack_push in sections["transitions"]:
+
+    def add_transition(parts, line_number):
+        from_state, input_sym, stack_top, to_state = parts[:4]
+        stack_push = parts[4:] if len(parts) > 4 else ['e']
         key = (from_state, input_sym, stack_top)
         if key not in transitions:
             transitions[key] = []
         transitions[key].append((to_state, stack_push))
 
+    sections = read_config(filename, PDA_CONFIG, add_transition)
+
     # Validate all main parts exist
     if not (sections["states"] and sections["alphabet"] and sections["stack_alphabet"] and sections["start"] and
             sections["start_stack"] and sections["accept"] and transitions):
@@ -143,6 +627,13 @@ def parse_pda_config(filename):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the PDA from pda_config.txt on input.txt.")
+    parser.add_argument("--stream", action="store_true",
+                        help="read input.txt lazily in chunks instead of loading it whole")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="characters read at a time with --stream")
+    args = parser.parse_args()
+
     try:
         pda = parse_pda_config("pda_config.txt")
     except Exception as e:
@@ -150,13 +641,17 @@ if __name__ == "__main__":
         exit(1)
 
     try:
-        with open("input.txt") as f:
-            input_str = f.read().strip()
+        if args.stream:
+            input_str = iter_symbols("input.txt", args.chunk_size)
+        else:
+            with open("input.txt") as f:
+                input_str = f.read().strip()
     except FileNotFoundError:
         print("[FATAL ERROR] 'input.txt' not found.")
         exit(1)
 
-    print(f"[INFO] Input symbols: {input_str.split()}")
+    if not args.stream:
+        print(f"[INFO] Input symbols: {input_str.split()}")
     if pda.accepts(input_str):
         print("Accepted")
     else:
@@ -1,3 +1,89 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.config import ConfigSchema, read_config
+from lfa.stream import DEFAULT_CHUNK_SIZE, iter_symbols
+
+# Halting flags of CompiledTM states
+RUNNING = 0
+ACCEPTING = 1
+REJECTING = 2
+
+MOVES = {'L': -1, 'R': 1, 'S': 0}
+
+
+def _step_failure(tm, state, symbol):
+    # the checks of one step of TuringMachine.accepts, in the same order: (level, message)
+    # if a step from state on symbol stops the run, else None
+    if symbol not in tm.tape_alphabet:
+        return "[ERROR]", f"Symbol '{symbol}' on tape not in tape alphabet."
+    key = (state, symbol)
+    if key not in tm.transition_function:
+        if symbol == tm.blank_symbol:
+            return "[INFO]", f"Hit blank at state '{state}' — assuming no valid transition."
+        return "[ERROR]", f"No transition defined for state '{state}' and symbol '{symbol}'."
+    _, write_symbol, direction = tm.transition_function[key]
+    if write_symbol not in tm.tape_alphabet:
+        return "[ERROR]", f"Write symbol '{write_symbol}' not in tape alphabet."
+    if direction not in MOVES:
+        return "[ERROR]", f"Invalid move direction '{direction}', expected 'L', 'R', or 'S'."
+    return None
+
+
+class Tape:
+    """
+    Tape kept as two stacks around the head: left holds the cells left of the head and right
+    the cells right of it, nearest cell last in both. A move is an amortized O(1) push and pop
+    in either direction. Cells never visited are blank without being stored, and blanks the
+    head leaves behind at either end of the used tape are dropped again. position is the
+    head's cell, counted from the first input symbol.
+    """
+
+    def __init__(self, symbols, blank_symbol):
+        self.blank_symbol = blank_symbol
+        self.left = []
+        self.right = list(symbols)[::-1]
+        self.current = self.right.pop() if self.right else blank_symbol
+        self.position = 0
+
+    def read(self):
+        return self.current
+
+    def write(self, symbol):
+        self.current = symbol
+
+    def move_left(self):
+        if self.right or self.current != self.blank_symbol:
+            self.right.append(self.current)
+        self.current = self.left.pop() if self.left else self.blank_symbol
+        self.position -= 1
+
+    def move_right(self):
+        if self.left or self.current != self.blank_symbol:
+            self.left.append(self.current)
+        self.current = self.right.pop() if self.right else self.blank_symbol
+        self.position += 1
+
+    def put(self, position, symbol):
+        """Write symbol into the cell at position without moving the head."""
+        offset = position - self.position
+        if offset == 0:
+            self.current = symbol
+            return
+        cells = self.right if offset > 0 else self.left
+        distance = abs(offset)
+        if distance > len(cells):
+            # unstored blanks up to the far end of that side, far end first
+            cells[:0] = [self.blank_symbol] * (distance - len(cells))
+        cells[len(cells) - distance] = symbol
+
+    def contents(self):
+        """The stored cells from left to right; the head is at index len(self.left)."""
+        return self.left + [self.current] + self.right[::-1]
+
+
 class TuringMachine:
     def __init__(self, states, input_alphabet, tape_alphabet, blank_symbol,
                  transition_function, start_state, accept_states, reject_states):
@@ -10,14 +96,20 @@ class TuringMachine:
         self.accept_states = set(accept_states)
         self.reject_states = set(reject_states)
 
-    def accepts(self, input_symbols, max_steps=10000):
+    def accepts(self, input_symbols, max_steps=10000, observer=None):
+        # input_symbols may be any iterable (e.g. iter_symbols(filename)); it is read once
+        # while being validated, straight onto the tape. An lfa.observe.Observer, if given,
+        # is told about every state, transition and head move.
+        symbols = []
         for sym in input_symbols:
             if sym not in self.input_alphabet:
                 error = f"Input symbol '{sym}' not in input alphabet."
                 print(f"[ERROR] {error}")
                 return False, error
-        tape = list(input_symbols) + [self.blank_symbol] * max(10, len(input_symbols))
-        head = 0
+            symbols.append(sym)
+        tape = Tape(symbols, self.blank_symbol)
+        if observer is not None:
+            return self._accepts_observed(tape, max_steps, observer)
         current_state = self.start_state
         steps = 0
 
@@ -30,14 +122,7 @@ class TuringMachine:
             if current_state in self.reject_states:
                 return False, None
 
-            if head < 0:
-                tape.insert(0, self.blank_symbol)
-                head = 0
-
-            if head >= len(tape):
-                tape.append(self.blank_symbol)
-
-            current_symbol = tape[head]
+            current_symbol = tape.read()
 
             if current_symbol not in self.tape_alphabet:
                 error = f"Symbol '{current_symbol}' on tape not in tape alphabet."
@@ -67,84 +152,361 @@ class TuringMachine:
                 print(f"[ERROR] {error}")
                 return False, error
 
-            tape[head] = write_symbol
+            tape.write(write_symbol)
             current_state = new_state
 
             if direction == 'L':
+                tape.move_left()
+            elif direction == 'R':
+                tape.move_right()
+            # 'S' no move
+
+        error = "Max steps exceeded without halting."
+        print(f"[ERROR] {error}")
+        return False, error
+
+    def _accepts_observed(self, tape, max_steps, observer):
+        current_state = self.start_state
+        head = 0
+        observer.begin()
+        observer.visit(current_state)
+        observer.head(head)
+        steps = 0
+        while steps < max_steps:
+            steps += 1
+            if current_state in self.accept_states:
+                return True, None
+            if current_state in self.reject_states:
+                return False, None
+
+            current_symbol = tape.read()
+            failure = _step_failure(self, current_state, current_symbol)
+            if failure is not None:
+                level, message = failure
+                print(f"{level} {message}")
+                return False, message
+
+            key = (current_state, current_symbol)
+            new_state, write_symbol, direction = self.transition_function[key]
+            observer.transition(key, new_state)
+            tape.write(write_symbol)
+            current_state = new_state
+            observer.visit(current_state)
+            if direction == 'L':
+                tape.move_left()
                 head -= 1
             elif direction == 'R':
+                tape.move_right()
                 head += 1
-            # 'S' no move
+            observer.head(head)
 
         error = "Max steps exceeded without halting."
         print(f"[ERROR] {error}")
         return False, error
 
+    def compile(self):
+        return CompiledTM(self)
 
-def parse_tm_config(filename):
-    sections = {
-        "states": [],
-        "input_alphabet": [],
-        "tape_alphabet": [],
-        "blank": None,
-        "start": None,
-        "accept": [],
-        "reject": [],
-        "transitions": []
-    }
-
-    with open(filename, "r") as f:
-        lines = []
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            # Remove inline comments
-            if "#" in line:
-                line = line.split("#")[0].strip()
-            if line:
-                lines.append(line)
-
-    current_section = None
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        if line.endswith(":"):
-            current_section = line[:-1].strip()
-            i += 1
-            section_lines = []
-            while i < len(lines) and not lines[i].endswith(":"):
-                section_lines.append(lines[i])
-                i += 1
-
-            if current_section in ["states", "input_alphabet", "tape_alphabet", "accept", "reject"]:
-                # Flatten multiline into tokens
-                all_items = " ".join(section_lines).split()
-                sections[current_section] = all_items
-            elif current_section in ["blank", "start"]:
-                if section_lines:
-                    sections[current_section] = section_lines[0]
-            elif current_section == "transitions":
-                for tline in section_lines:
-                    parts = tline.split()
-                    if len(parts) == 5:
-                        # Format: current_state current_symbol new_state write_symbol direction
-                        cur_st, cur_sym, new_st, write_sym, direction = parts
-                        sections["transitions"].append((cur_st, cur_sym, new_st, write_sym, direction))
-                    else:
-                        print(f"[WARNING] Invalid transition line: '{tline}'")
+    def start(self, input_symbols=()):
+        session = TMSession(self)
+        session.feed(input_symbols)
+        return session
+
+
+class TMSession:
+    """
+    A TuringMachine run that can be continued. feed() writes more input onto the tape right
+    after the symbols fed before (over whatever the machine left there), and run() resumes the
+    computation from the current state, tape and head for at most max_steps more steps,
+    returning (accepted, error) like accepts(). A run that only ran out of steps can be resumed
+    by calling run() again; once the machine halts, the result stays.
+    """
+
+    def __init__(self, tm):
+        self.tm = tm
+        self.tape = Tape((), tm.blank_symbol)
+        self.state = tm.start_state
+        self.steps = 0
+        self.input_length = 0
+        self.result = None
+
+    def feed(self, input_symbols):
+        if self.result is not None:
+            return
+        tape = self.tape
+        for sym in input_symbols:
+            if sym not in self.tm.input_alphabet:
+                error = f"Input symbol '{sym}' not in input alphabet."
+                print(f"[ERROR] {error}")
+                self.result = (False, error)
+                return
+            tape.put(self.input_length, sym)
+            self.input_length += 1
+
+    def run(self, max_steps=10000):
+        if self.result is not None:
+            return self.result
+        tm = self.tm
+        tape = self.tape
+        current_state = self.state
+        for _ in range(max_steps):
+            self.steps += 1
+            if current_state in tm.accept_states:
+                self.result = (True, None)
+                break
+            if current_state in tm.reject_states:
+                self.result = (False, None)
+                break
+
+            current_symbol = tape.read()
+            failure = _step_failure(tm, current_state, current_symbol)
+            if failure is not None:
+                level, message = failure
+                print(f"{level} {message}")
+                self.result = (False, message)
+                break
+
+            current_state, write_symbol, direction = tm.transition_function[(current_state, current_symbol)]
+            tape.write(write_symbol)
+            if direction == 'L':
+                tape.move_left()
+            elif direction == 'R':
+                tape.move_right()
+        self.state = current_state
+        if self.result is not None:
+            return self.result
+
+        error = "Max steps exceeded without halting."
+        print(f"[ERROR] {error}")
+        return False, error
+
+    def is_accepting(self):
+        return self.state in self.tm.accept_states
+
+    def snapshot(self):
+        tape = self.tape
+        return (self.state, self.steps, self.input_length, self.result,
+                list(tape.left), tape.current, list(tape.right), tape.position)
+
+    def restore(self, snapshot):
+        self.state, self.steps, self.input_length, self.result, left, current, right, position = snapshot
+        tape = self.tape
+        tape.left, tape.current, tape.right, tape.position = list(left), current, list(right), position
+
+
+class CompiledTM:
+    """
+    Turing machine with states and tape symbols encoded as ints and the transition function
+    flattened into arrays indexed by state * width + symbol: next_state, write and move
+    (-1, 0, 1). Every transition is validated once here; an entry that would stop the run
+    (no transition, a symbol outside the tape alphabet, a bad direction) gets next_state -1
+    and its message in failures, so the run loop does a single lookup per step and reports
+    exactly what TuringMachine.accepts reports.
+    """
+
+    def __init__(self, tm):
+        self.input_alphabet = set(tm.input_alphabet)
+        # input symbols missing from the tape alphabet can still end up on the tape
+        self.symbol_names = sorted(tm.tape_alphabet) + sorted(self.input_alphabet - tm.tape_alphabet)
+        self.symbol_index = {name: i for i, name in enumerate(self.symbol_names)}
+        names = set(tm.states) | {tm.start_state} | tm.accept_states | tm.reject_states
+        for (state, _), (new_state, _, _) in tm.transition_function.items():
+            names.add(state)
+            names.add(new_state)
+        self.state_names = sorted(names)
+        self.state_index = {name: i for i, name in enumerate(self.state_names)}
+
+        self.start = self.state_index[tm.start_state]
+        self.blank = self.symbol_index[tm.blank_symbol]
+        self.width = len(self.symbol_names)
+        self.halting = [RUNNING] * len(self.state_names)
+        for state in tm.reject_states:
+            self.halting[self.state_index[state]] = REJECTING
+        for state in tm.accept_states:
+            self.halting[self.state_index[state]] = ACCEPTING
+
+        size = len(self.state_names) * self.width
+        self.next_state = [-1] * size
+        self.write = [0] * size
+        self.move = [0] * size
+        self.failures = {}
+        for state in self.state_names:
+            for symbol in self.symbol_names:
+                index = self.state_index[state] * self.width + self.symbol_index[symbol]
+                failure = _step_failure(tm, state, symbol)
+                if failure is not None:
+                    self.failures[index] = failure
+                    continue
+                new_state, write_symbol, direction = tm.transition_function[(state, symbol)]
+                self.next_state[index] = self.state_index[new_state]
+                self.write[index] = self.symbol_index[write_symbol]
+                self.move[index] = MOVES[direction]
+
+        # sweep[index] is the move of a transition that keeps both state and symbol and moves
+        # the head, like "q1 zero q1 zero R": it repeats over a whole run of that symbol
+        self.sweep = [0] * size
+        for index in range(size):
+            state, symbol = divmod(index, self.width)
+            if self.next_state[index] == state and self.write[index] == symbol:
+                self.sweep[index] = self.move[index]
+
+    def accepts(self, input_symbols, max_steps=10000, accelerate=False):
+        """
+        accelerate: run over a run-length encoded tape and cross a run of identical symbols
+        in a single macro step wherever the current transition is a sweep; steps still
+        count one per cell, so max_steps and the results are the same as without it
+        """
+        codes = []
+        for sym in input_symbols:
+            if sym not in self.input_alphabet:
+                error = f"Input symbol '{sym}' not in input alphabet."
+                print(f"[ERROR] {error}")
+                return False, error
+            codes.append(self.symbol_index[sym])
+        if accelerate:
+            return self._run_accelerated(codes, max_steps)
+
+        # the Tape two-stack layout, inlined on ints
+        blank = self.blank
+        left = []
+        right = codes[::-1]
+        current = right.pop() if right else blank
+
+        halting = self.halting
+        next_state = self.next_state
+        write = self.write
+        move = self.move
+        width = self.width
+        state = self.start
+        steps = 0
+        while steps < max_steps:
+            steps += 1
+            halt = halting[state]
+            if halt:
+                return halt == ACCEPTING, None
+
+            index = state * width + current
+            state = next_state[index]
+            if state < 0:
+                level, message = self.failures[index]
+                print(f"{level} {message}")
+                return False, message
+
+            current = write[index]
+            direction = move[index]
+            if direction == 1:
+                if left or current != blank:
+                    left.append(current)
+                current = right.pop() if right else blank
+            elif direction == -1:
+                if right or current != blank:
+                    right.append(current)
+                current = left.pop() if left else blank
+
+        error = "Max steps exceeded without halting."
+        print(f"[ERROR] {error}")
+        return False, error
+
+    def _run_accelerated(self, codes, max_steps):
+        # left and right hold [symbol, count] runs, nearest run last; as with Tape, blank
+        # runs at either far end are not stored
+        blank = self.blank
+        left = []
+        right = []
+        for code in reversed(codes):
+            if right and right[-1][0] == code:
+                right[-1][1] += 1
             else:
-                # unknown section, just skip
-                pass
-        else:
-            i += 1
+                right.append([code, 1])
+        current = blank
+        if right:
+            current = right[-1][0]
+            right[-1][1] -= 1
+            if not right[-1][1]:
+                right.pop()
+
+        halting = self.halting
+        next_state = self.next_state
+        write = self.write
+        move = self.move
+        sweep = self.sweep
+        width = self.width
+        state = self.start
+        steps = 0
+        while steps < max_steps:
+            halt = halting[state]
+            if halt:
+                return halt == ACCEPTING, None
+
+            index = state * width + current
+            direction = sweep[index]
+            if direction:
+                # cross the run of `current` starting at the head, then stand on the next cell
+                ahead, behind = (right, left) if direction == 1 else (left, right)
+                length = 1
+                if ahead and ahead[-1][0] == current:
+                    length += ahead.pop()[1]
+                if current == blank and not ahead:
+                    # only blanks ahead, the sweep never ends
+                    break
+                if steps + length > max_steps:
+                    break
+                steps += length
+                if behind and behind[-1][0] == current:
+                    behind[-1][1] += length
+                elif behind or current != blank:
+                    behind.append([current, length])
+                if ahead:
+                    current = ahead[-1][0]
+                    ahead[-1][1] -= 1
+                    if not ahead[-1][1]:
+                        ahead.pop()
+                else:
+                    current = blank
+                continue
+
+            steps += 1
+            state = next_state[index]
+            if state < 0:
+                level, message = self.failures[index]
+                print(f"{level} {message}")
+                return False, message
+
+            current = write[index]
+            direction = move[index]
+            if direction:
+                ahead, behind = (right, left) if direction == 1 else (left, right)
+                if behind and behind[-1][0] == current:
+                    behind[-1][1] += 1
+                elif behind or current != blank:
+                    behind.append([current, 1])
+                if ahead:
+                    current = ahead[-1][0]
+                    ahead[-1][1] -= 1
+                    if not ahead[-1][1]:
+                        ahead.pop()
+                else:
+                    current = blank
+
+        error = "Max steps exceeded without halting."
+        print(f"[ERROR] {error}")
+        return False, error
+
+
+TM_CONFIG = ConfigSchema(
+    "TM", lists=("states", "input_alphabet", "tape_alphabet", "accept", "reject"), values=("blank", "start"),
+    transition_fields=(5, 5))
 
-    # Build transitions dict
+
+def parse_tm_config(filename):
     transitions = {}
-    for cur_st, cur_sym, new_st, write_sym, direction in sections["transitions"]:
-        key = (cur_st, cur_sym)
-        transitions[key] = (new_st, write_sym, direction)
+
+    def add_transition(parts, line_number):
+        # Format: current_state current_symbol new_state write_symbol direction
+        cur_st, cur_sym, new_st, write_sym, direction = parts
+        transitions[(cur_st, cur_sym)] = (new_st, write_sym, direction)
+
+    sections = read_config(filename, TM_CONFIG, add_transition)
 
     # Validate mandatory fields
     required = ["states", "input_alphabet", "tape_alphabet", "blank", "start", "accept"]
@@ -163,11 +525,20 @@ def parse_tm_config(filename):
         transition_function=transitions,
         start_state=sections["start"],
         accept_states=sections["accept"],
-        reject_states=sections.get("reject", [])
+        reject_states=sections["reject"]
     )
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the TM from tm_config.txt on input.txt.")
+    parser.add_argument("--stream", action="store_true",
+                        help="read input.txt in chunks straight onto the tape")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="characters read at a time with --stream")
+    parser.add_argument("--accelerate", action="store_true",
+                        help="compile the TM and cross runs of identical symbols in one step")
+    args = parser.parse_args()
+
     try:
         tm = parse_tm_config("tm_config.txt")
     except Exception as e:
@@ -175,15 +546,22 @@ if __name__ == "__main__":
         exit(1)
 
     try:
-        with open("input.txt", "r") as f:
-            input_str = f.read().strip()
-            input_symbols = input_str.split()
+        if args.stream:
+            input_symbols = iter_symbols("input.txt", args.chunk_size)
+        else:
+            with open("input.txt", "r") as f:
+                input_str = f.read().strip()
+                input_symbols = input_str.split()
     except FileNotFoundError:
         print("[FATAL ERROR] 'input.txt' not found.")
         exit(1)
 
-    print(f"[INFO] Input symbols: {input_symbols}")
-    result, error = tm.accepts(input_symbols)
+    if not args.stream:
+        print(f"[INFO] Input symbols: {input_symbols}")
+    if args.accelerate:
+        result, error = tm.compile().accepts(input_symbols, accelerate=True)
+    else:
+        result, error = tm.accepts(input_symbols)
     if result:
         print("Accepted")
     else:
@@ -0,0 +1 @@
+"""Timing and memory benchmarks for the four machines, see benchmarks/run.py."""
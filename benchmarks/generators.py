@@ -0,0 +1,90 @@
+"""
+Synthetic machines and inputs for the benchmarks. Every generator takes a random.Random, so
+a seed reproduces the same machine.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import load_module
+
+
+def random_dfa(rng, num_states=50, num_symbols=4):
+    """A complete DFA with uniformly random transitions and about a third of the states accepting."""
+    states = [f"s{i}" for i in range(num_states)]
+    alphabet = [f"a{i}" for i in range(num_symbols)]
+    transitions = {(state, symbol): rng.choice(states) for state in states for symbol in alphabet}
+    accept = [state for state in states if rng.random() < 1 / 3] or [states[-1]]
+    return load_module("dfa").DFA(states, alphabet, transitions, states[0], accept)
+
+
+def dense_nfa(rng, num_states=200, num_symbols=2, fanout=8):
+    """An NFA where every state has fanout random successors on every symbol, so most states stay active."""
+    states = [f"s{i}" for i in range(num_states)]
+    alphabet = [f"a{i}" for i in range(num_symbols)]
+    transitions = {(state, symbol): {rng.choice(states) for _ in range(fanout)}
+                   for state in states for symbol in alphabet}
+    accept = [state for state in states if rng.random() < 0.1] or [states[-1]]
+    return load_module("nfa").NFA(states, alphabet, transitions, states[0], accept)
+
+
+def palindrome_pda():
+    """
+    Even length palindromes over {a, b}. Nondeterministic and ambiguous: at every position the
+    PDA may guess that it has reached the middle, which is the worst case for the DFS engine.
+    """
+    transitions = {
+        ("push", "a", "e"): [("push", ["A"])],
+        ("push", "b", "e"): [("push", ["B"])],
+        ("push", "e", "e"): [("pop", ["e"])],
+        ("pop", "a", "A"): [("pop", ["e"])],
+        ("pop", "b", "B"): [("pop", ["e"])],
+        ("pop", "e", "Z"): [("done", ["Z"])],
+    }
+    return load_module("pda").PDA(["push", "pop", "done"], ["a", "b"], ["Z", "A", "B"],
+                                  transitions, "push", "Z", ["done"])
+
+
+def counting_pda():
+    """a^n b^n, deterministic, like PDA/pda_config.txt."""
+    transitions = {
+        ("q0", "a", "Z"): [("q0", ["X", "Z"])],
+        ("q0", "a", "X"): [("q0", ["X", "X"])],
+        ("q0", "b", "X"): [("q1", ["e"])],
+        ("q1", "b", "X"): [("q1", ["e"])],
+        ("q1", "e", "Z"): [("q2", ["Z"])],
+    }
+    return load_module("pda").PDA(["q0", "q1", "q2"], ["a", "b"], ["Z", "X"], transitions, "q0", "Z", ["q2"])
+
+
+def marking_tm():
+    """
+    Decides zero^n one^n by marking one zero and one one per round trip, like
+    TuringMachine/tm_config.txt: O(n^2) steps, almost all of them in sweeping self-loops.
+    """
+    transitions = {
+        ("q0", "zero"): ("q1", "markedZero", "R"),
+        ("q0", "markedOne"): ("q3", "markedOne", "R"),
+        ("q0", "_"): ("accept", "_", "S"),
+        ("q1", "zero"): ("q1", "zero", "R"),
+        ("q1", "markedOne"): ("q1", "markedOne", "R"),
+        ("q1", "one"): ("q2", "markedOne", "L"),
+        ("q2", "zero"): ("q2", "zero", "L"),
+        ("q2", "markedOne"): ("q2", "markedOne", "L"),
+        ("q2", "markedZero"): ("q0", "markedZero", "R"),
+        ("q3", "markedOne"): ("q3", "markedOne", "R"),
+        ("q3", "_"): ("accept", "_", "S"),
+    }
+    return load_module("tm").TuringMachine(
+        ["q0", "q1", "q2", "q3", "accept", "reject"], ["zero", "one"],
+        ["zero", "one", "markedZero", "markedOne", "_"], "_", transitions, "q0", ["accept"], ["reject"])
+
+
+def random_word(rng, alphabet, length):
+    alphabet = sorted(alphabet)
+    return [rng.choice(alphabet) for _ in range(length)]
+
+
+def palindrome(rng, length):
+    half = random_word(rng, ["a", "b"], length // 2)
+    return half + half[::-1]
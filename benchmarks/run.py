@@ -0,0 +1,167 @@
+"""
+Parameterized timing and peak memory measurements of the machines' hot paths.
+
+    python -m benchmarks.run --sizes 100 1000 --repeat 5 --output results.json
+
+Every benchmark builds its machine and input for a size (an input length) once, then times
+repeated runs of it; peak memory is measured in a separate run under tracemalloc, which would
+otherwise slow the timed runs down. Results are written as JSON so that runs of different
+versions can be compared.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks import generators
+from lfa.machines import load_module
+
+
+def _dfa(size, rng):
+    dfa = generators.random_dfa(rng)
+    return dfa, " ".join(generators.random_word(rng, dfa.alphabet, size))
+
+
+def _dfa_batch(size, rng):
+    dfa = generators.random_dfa(rng)
+    return dfa.compile(), [" ".join(generators.random_word(rng, dfa.alphabet, size)) for _ in range(1000)]
+
+
+def _dfa_set(size, rng):
+    dfas = [generators.random_dfa(rng, num_states=4) for _ in range(8)]
+    return dfas, " ".join(generators.random_word(rng, dfas[0].alphabet, size))
+
+
+def _product(size, rng):
+    dfas, data = _dfa_set(size, rng)
+    return load_module("dfa").ProductDFA(dfas), data
+
+
+def _nfa(size, rng):
+    nfa = generators.dense_nfa(rng)
+    return nfa, generators.random_word(rng, nfa.alphabet, size)
+
+
+def _near_palindrome(size, rng):
+    # a...ab: every middle guess matches for a long way before the last symbol rejects it
+    return generators.palindrome_pda(), " ".join(["a"] * (size - 1) + ["b"])
+
+
+def _counting(size, rng):
+    return generators.counting_pda(), " ".join(["a"] * (size // 2) + ["b"] * (size // 2))
+
+
+def _marking(size, rng):
+    return generators.marking_tm(), ["zero"] * (size // 2) + ["one"] * (size // 2)
+
+
+def _compiled(make, **options):
+    def make_compiled(size, rng):
+        machine, data = make(size, rng)
+        return machine.compile(**options), data
+    return make_compiled
+
+
+def _lazy(size, rng):
+    nfa, data = _nfa(size, rng)
+    return nfa.lazy(), data
+
+
+# benchmark name -> (make(size, rng) returning a machine and its input, run(machine, input),
+# largest size worth running it at)
+BENCHMARKS = {
+    "dfa.accepts": (_dfa, lambda dfa, data: dfa.accepts(data), None),
+    "dfa.compiled": (_compiled(_dfa), lambda dfa, data: dfa.accepts(data), None),
+    "dfa.accepts_many": (_dfa_batch, lambda dfa, data: dfa.accepts_many(data), 10000),
+    "dfa.each": (_dfa_set, lambda dfas, data: [dfa.accepts(data) for dfa in dfas], None),
+    "dfa.product": (_product, lambda product, data: product.matches(data), None),
+    "nfa.accepts": (_nfa, lambda nfa, data: nfa.accepts(data), None),
+    "nfa.bitset": (_compiled(_nfa), lambda nfa, data: nfa.accepts(data), None),
+    "nfa.lazy": (_lazy, lambda nfa, data: nfa.accepts(data), None),
+    "pda.dfs": (_near_palindrome, lambda pda, data: pda.accepts(data, engine="dfs"), 1000),
+    "pda.memo": (_near_palindrome, lambda pda, data: pda.accepts(data, engine="memo"), 1000),
+    "pda.saturation": (_near_palindrome, lambda pda, data: pda.accepts(data, engine="saturation"), 1000),
+    "pda.counting_dfs": (_counting, lambda pda, data: pda.accepts(data, engine="dfs"), 10000),
+    "pda.deterministic": (_counting, lambda pda, data: pda.accepts(data, engine="deterministic"), None),
+    "tm.accepts": (_marking, lambda tm, data: tm.accepts(data, max_steps=10 ** 9), 2000),
+    "tm.compiled": (_compiled(_marking), lambda tm, data: tm.accepts(data, max_steps=10 ** 9), 2000),
+    "tm.accelerated": (_compiled(_marking), lambda tm, data: tm.accepts(data, max_steps=10 ** 9, accelerate=True),
+                       None),
+}
+
+
+def measure(name, size, repeat, seed):
+    make, run, _ = BENCHMARKS[name]
+    machine, data = make(size, random.Random(seed))
+    # the machines report rejections and errors with print, keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(machine, data)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            run(machine, data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "benchmark": name,
+        "size": size,
+        "repeat": repeat,
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_bytes": peak,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="input lengths")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", default=None,
+                        help="benchmark names or prefixes to run, e.g. dfa pda.memo")
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS
+             if args.only is None or any(name == only or name.startswith(only + ".") for only in args.only)]
+    results = []
+    for name in names:
+        _, _, largest = BENCHMARKS[name]
+        for size in args.sizes:
+            if largest is not None and size > largest:
+                continue
+            result = measure(name, size, args.repeat, args.seed)
+            print(f"[INFO] {name:<18} size {size:>8}: {result['seconds_min']:.6f}s, "
+                  f"{result['peak_bytes']} bytes peak", file=sys.stderr)
+            results.append(result)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
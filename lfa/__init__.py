@@ -0,0 +1 @@
+"""Helpers shared by the DFA, NFA, PDA and TuringMachine scripts."""
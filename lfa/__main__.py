@@ -0,0 +1,5 @@
+import sys
+
+from lfa.cli import main
+
+sys.exit(main())
@@ -0,0 +1,77 @@
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from lfa import machines
+
+DEFAULT_BATCH_SIZE = 1000
+
+# state of a pool worker, set once by _init_worker
+_worker = {}
+
+
+def iter_inputs(path):
+    """
+    Yields (name, input_string) pairs: one per line of a file (named by line number),
+    or one per file of a directory (named by file name, in sorted order).
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            filename = os.path.join(path, name)
+            if os.path.isfile(filename):
+                with open(filename, "r") as f:
+                    yield name, f.read()
+    else:
+        with open(path, "r") as f:
+            for number, line in enumerate(f, 1):
+                yield str(number), line
+
+
+def _init_worker(kind, payload, max_steps):
+    # the machine classes live in scripts loaded by path, so load the script before unpickling
+    machines.load_module(kind)
+    _worker["kind"] = kind
+    _worker["machine"] = pickle.loads(payload)
+    _worker["max_steps"] = max_steps
+
+
+def _evaluate(item):
+    name, input_string = item
+    accepted, error = machines.run(_worker["kind"], _worker["machine"], input_string, _worker["max_steps"])
+    return {"input": name, "accepted": accepted, "error": error}
+
+
+def run_batch(kind, machine, inputs, output, workers=1, max_steps=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Evaluates a compiled machine on (name, input_string) pairs and writes one JSON line per
+    input to output, in input order. Inputs are read batch_size at a time, so memory does not
+    grow with their number; with workers > 1 each batch is spread over a process pool whose
+    workers receive the machine once, when they start.
+    Returns the number of inputs evaluated.
+    """
+    payload = pickle.dumps(machine)
+    count = 0
+    inputs = iter(inputs)
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(kind, payload, max_steps))
+    else:
+        _init_worker(kind, payload, max_steps)
+        executor = None
+    try:
+        while True:
+            batch = list(islice(inputs, batch_size))
+            if not batch:
+                break
+            if executor is None:
+                results = map(_evaluate, batch)
+            else:
+                results = executor.map(_evaluate, batch, chunksize=max(1, len(batch) // (workers * 4)))
+            for result in results:
+                output.write(json.dumps(result) + "\n")
+            count += len(batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return count
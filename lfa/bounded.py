@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+EVICTIONS = ("lru", "flush")
+
+
+class BoundedCache:
+    """
+    A dict of at most max_states entries, for the states a lazily built automaton (NFA's
+    LazyDFA, DFA's ProductDFA) has reached so far. When it is full, add() makes room first:
+    eviction="lru" drops the least recently used entry, eviction="flush" empties the whole
+    cache, which is cheaper per miss but rebuilds everything after it.
+    """
+
+    def __init__(self, max_states=10000, eviction="lru"):
+        if eviction not in EVICTIONS:
+            raise ValueError(f"Unknown eviction policy '{eviction}', expected 'lru' or 'flush'.")
+        if max_states < 1:
+            raise ValueError("max_states must be at least 1.")
+        self.max_states = max_states
+        self.eviction = eviction
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """The entry stored under key, or None; with "lru" it becomes the most recently used."""
+        entry = self.entries.get(key)
+        if entry is not None and self.eviction == "lru":
+            self.entries.move_to_end(key)
+        return entry
+
+    def add(self, key, entry):
+        """Stores entry under key, evicting first if the cache is full, and returns it."""
+        if len(self.entries) >= self.max_states:
+            if self.eviction == "lru":
+                self.entries.popitem(last=False)
+            else:
+                self.entries.clear()
+        self.entries[key] = entry
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
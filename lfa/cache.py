@@ -0,0 +1,74 @@
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+
+from lfa import machines
+
+# bump when the cache layout changes, to invalidate every existing entry
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get("LFA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "lfa"))
+
+
+def cache_key(kind, config_bytes):
+    """
+    Content hash of a config, together with the sources of the script, the config reader and
+    lfa/machines.py (whose compile_machine() decides what gets cached) that parse and compile
+    it, so that editing any of them invalidates the cached machine.
+    """
+    script, _ = machines.MACHINES[kind]
+    sources = []
+    for path in (os.path.join(machines.ROOT, script), os.path.join(os.path.dirname(__file__), "config.py"),
+                 machines.__file__):
+        with open(path, "rb") as f:
+            sources.append(f.read())
+    digest = hashlib.sha256()
+    for part in (str(CACHE_VERSION).encode(), kind.encode(), *sources, config_bytes):
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def load_machine(kind, filename, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the compiled machine (see machines.compile_machine) for a config file. The result
+    is pickled into cache_dir under the config's cache_key and later loads read it back
+    through a memory map instead of parsing and compiling the config again.
+    cache_dir=None disables the cache.
+    """
+    if cache_dir is None:
+        return machines.compile_machine(kind, machines.parse_config(kind, filename))
+
+    with open(filename, "rb") as f:
+        config_bytes = f.read()
+    path = os.path.join(cache_dir, f"{kind}-{cache_key(kind, config_bytes)}.pickle")
+
+    # the machine classes live in scripts loaded by path, so load the script before unpickling
+    machines.load_module(kind)
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return pickle.loads(data)
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        # a truncated or foreign file, or one written by an older layout of the classes
+        print(f"[WARNING] Ignoring unreadable cache entry '{path}': {err}", file=sys.stderr)
+
+    machine = machines.compile_machine(kind, machines.parse_config(kind, filename))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first so concurrent loads never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(machine, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as err:
+        print(f"[WARNING] Could not write cache entry '{path}': {err}", file=sys.stderr)
+    return machine
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+
+from lfa import machines
+from lfa.batch import DEFAULT_BATCH_SIZE, iter_inputs, run_batch
+from lfa.cache import DEFAULT_CACHE_DIR, load_machine
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m lfa", description="Run automata over many inputs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="evaluate one machine on every input, writing JSON lines")
+    run.add_argument("--machine", required=True, choices=sorted(machines.MACHINES))
+    run.add_argument("--config", required=True, help="machine config file")
+    run.add_argument("--inputs", required=True,
+                     help="a file with one input per line, or a directory with one input per file")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    run.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="inputs read at a time")
+    run.add_argument("--max-steps", type=int, default=None,
+                     help="per-input step budget for PDA and TM runs")
+    run.add_argument("--output", default=None, help="JSONL file to write (default: stdout)")
+    run.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                     help="where compiled configs are cached (default: %(default)s)")
+    run.add_argument("--no-cache", action="store_true", help="always parse and compile the config")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        machine = load_machine(args.machine, args.config, None if args.no_cache else args.cache_dir)
+    except Exception as e:
+        print(f"[FATAL ERROR] Failed to build {args.machine.upper()}:", e, file=sys.stderr)
+        return 1
+
+    if not os.path.exists(args.inputs):
+        print(f"[FATAL ERROR] '{args.inputs}' not found.", file=sys.stderr)
+        return 1
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        count = run_batch(args.machine, machine, iter_inputs(args.inputs), output,
+                          workers=max(1, args.workers), max_steps=args.max_steps, batch_size=args.batch_size)
+    finally:
+        if args.output:
+            output.close()
+    print(f"[INFO] Evaluated {count} inputs.", file=sys.stderr)
+    return 0
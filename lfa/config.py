@@ -0,0 +1,63 @@
+class ConfigError(ValueError):
+    pass
+
+
+class ConfigSchema:
+    """
+    Sections a machine config may contain:
+    lists: sections whose whitespace separated items accumulate (states, alphabet, ...)
+    values: single value sections (start, blank, ...), the first line counts
+    transition_fields: (fewest, most) fields on a transition line, most=None for no limit
+    """
+
+    def __init__(self, name, lists=(), values=(), transition_fields=None):
+        self.name = name
+        self.lists = set(lists)
+        self.values = set(values)
+        self.transition_fields = transition_fields
+
+
+def read_config(filename, schema, on_transition):
+    """
+    Reads a config in a single pass over its lines, splitting each line once. Sections start
+    with a "name:" line or an inline "name: items" line; "#" starts a comment, and unknown
+    sections are skipped. Every transition line goes to on_transition(fields, line_number)
+    as soon as it is read, so nothing but the sections themselves is kept in memory.
+    Returns {section: list of items or value}; list sections default to [] and values to None.
+    Raises ConfigError, with the line number, for transition lines with a wrong field count.
+    """
+    sections = {name: [] for name in schema.lists}
+    sections.update((name, None) for name in schema.values)
+    fewest, most = schema.transition_fields or (0, None)
+
+    current_section = None
+    with open(filename, "r") as file:
+        for line_number, line in enumerate(file, 1):
+            if "#" in line:
+                line = line.partition("#")[0]
+            if ":" in line:
+                key, _, rest = line.partition(":")
+                key = key.strip()
+                # "name:" opens a section, and so does "name: items" if name is a single word
+                if not rest.strip() or (key and len(key.split()) == 1):
+                    current_section = key
+                    line = rest
+            fields = line.split()
+            if not fields:
+                continue
+
+            if current_section == "transitions" and schema.transition_fields:
+                if len(fields) < fewest or (most is not None and len(fields) > most):
+                    expected = str(fewest) if fewest == most else f"at least {fewest}"
+                    if most is not None and fewest != most:
+                        expected = f"{fewest} to {most}"
+                    raise ConfigError(f"{filename}, line {line_number}: invalid {schema.name} transition "
+                                      f"'{' '.join(fields)}', expected {expected} fields.")
+                on_transition(fields, line_number)
+            elif current_section in schema.lists:
+                sections[current_section].extend(fields)
+            elif current_section in schema.values:
+                if sections[current_section] is None:
+                    sections[current_section] = " ".join(fields)
+
+    return sections
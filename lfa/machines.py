@@ -0,0 +1,90 @@
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# machine kind -> (script, config parser)
+MACHINES = {
+    "dfa": (os.path.join("DFA", "Test.py"), "parse_dfa_config"),
+    "nfa": (os.path.join("NFA", "Test.py"), "parse_nfa_config"),
+    "pda": (os.path.join("PDA", "test.py"), "parse_pda_config"),
+    "tm": (os.path.join("TuringMachine", "test.py"), "parse_tm_config"),
+}
+
+
+def load_module(kind):
+    """
+    Imports the script of a machine kind. The scripts are standalone files rather than a
+    package, so each one is loaded by path and registered as e.g. "dfa_machine"; loading it
+    again returns the same module, so its classes stay the same (and picklable) everywhere.
+    """
+    name = f"{kind}_machine"
+    module = sys.modules.get(name)
+    if module is None:
+        script, _ = MACHINES[kind]
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, script))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+def parse_config(kind, filename):
+    module = load_module(kind)
+    _, parser = MACHINES[kind]
+    return getattr(module, parser)(filename)
+
+
+def compile_machine(kind, machine):
+    """The fastest form of a parsed machine that run() can evaluate inputs with."""
+    if kind in ("dfa", "nfa", "tm"):
+        return machine.compile()
+    return machine
+
+
+def _message(report):
+    # a reported message without its "[ERROR] " or "[INFO] " level, so that errors read
+    # the same whichever machine reported them
+    for level in ("[ERROR] ", "[INFO] "):
+        if report.startswith(level):
+            return report[len(level):]
+    return report
+
+
+def run(kind, machine, input_string, max_steps=None):
+    """
+    Evaluates one input on a machine from compile_machine().
+    Returns (accepted, error), where error is the message the machine reported, without its
+    [ERROR] or [INFO] level, or None.
+    max_steps bounds the work of PDA and TM runs.
+    """
+    if kind in ("dfa", "nfa"):
+        try:
+            symbols = input_string if kind == "dfa" else input_string.split()
+            return bool(machine.accepts(symbols)), None
+        except ValueError as err:
+            return False, _message(str(err))
+
+    # PDA and TM runs print their errors, keep them out of the caller's output
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        if kind == "pda":
+            module = load_module("pda")
+            if machine.deterministic:
+                accepted = machine.accepts(input_string, engine="deterministic", max_steps=max_steps)
+                return accepted, _message(output.getvalue().strip()) or None
+            outcome = machine.search(input_string, max_steps=max_steps)
+            if outcome == module.BUDGET_EXCEEDED:
+                return False, module.BUDGET_EXCEEDED_MESSAGE
+            return outcome == module.ACCEPTED, _message(output.getvalue().strip()) or None
+
+        if max_steps is None:
+            return machine.accepts(input_string.split(), accelerate=True)
+        return machine.accepts(input_string.split(), max_steps, accelerate=True)
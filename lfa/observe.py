@@ -0,0 +1,86 @@
+from collections import Counter, deque
+
+
+class Observer:
+    """
+    Hooks the machines call when accepts() is given an observer. Every hook does nothing,
+    subclass and override the ones you need.
+
+    The observed runs are separate copies of the main loops (DFA, NFA and TuringMachine
+    _accepts_observed, the PDA's "dfs" _accepts_observed and search()), so that runs
+    without an observer keep their plain loops and an unused observer costs nothing. Only
+    DFA.accepts, NFA.accepts, TuringMachine.accepts and the PDA's "dfs" and "memo" engines
+    take an observer; CompiledDFA, BitsetNFA, LazyDFA, ProductDFA, CompiledTM, the sessions
+    and the PDA's "deterministic" and "saturation" engines and streaming path run without.
+    """
+
+    def begin(self):
+        """A run starts; one observer can watch several runs one after the other."""
+
+    def visit(self, state):
+        """A state was entered (for an NFA: is active after a step)."""
+
+    def transition(self, key, target):
+        """The transition stored under key fired and led to target (for an NFA: a set of states)."""
+
+    def configuration(self, depth):
+        """A PDA configuration with a stack of the given depth was explored."""
+
+    def head(self, position):
+        """The TM head moved to position, counted from the first input cell."""
+
+
+class Profiler(Observer):
+    """
+    Collects per-state visit counts, a histogram of transition hits, the PDA's explored
+    configurations and largest stack, the TM tape extent and head travel, and the last
+    trace_size transitions in a ring buffer (trace_size=0 disables the trace). Counts add
+    up over all the runs it watches.
+    """
+
+    def __init__(self, trace_size=100):
+        self.state_visits = Counter()
+        self.transition_hits = Counter()
+        self.configurations = 0
+        self.max_stack_depth = 0
+        self.head_travel = 0
+        self.tape_extent = (0, 0)
+        self._position = 0
+        self.trace = deque(maxlen=trace_size)
+
+    def begin(self):
+        # every run starts with the head on the first input cell
+        self._position = 0
+
+    def visit(self, state):
+        self.state_visits[state] += 1
+
+    def transition(self, key, target):
+        self.transition_hits[key] += 1
+        if self.trace.maxlen:
+            self.trace.append((key, target))
+
+    def configuration(self, depth):
+        self.configurations += 1
+        if depth > self.max_stack_depth:
+            self.max_stack_depth = depth
+
+    def head(self, position):
+        self.head_travel += abs(position - self._position)
+        self._position = position
+        low, high = self.tape_extent
+        if position < low:
+            self.tape_extent = (position, high)
+        elif position > high:
+            self.tape_extent = (low, position)
+
+    def report(self):
+        return {
+            "state_visits": dict(self.state_visits),
+            "transition_hits": {" ".join(map(str, key)): hits for key, hits in self.transition_hits.items()},
+            "configurations": self.configurations,
+            "max_stack_depth": self.max_stack_depth,
+            "head_travel": self.head_travel,
+            "tape_extent": list(self.tape_extent),
+            "trace": [[" ".join(map(str, key)), str(target)] for key, target in self.trace],
+        }
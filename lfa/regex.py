@@ -0,0 +1,193 @@
+"""
+Regular expressions over word symbols, compiled into the NFA and DFA classes.
+
+A pattern is a sequence of symbols (words like zero or markedOne, separated by whitespace)
+combined with the operators | * + ? and parentheses, e.g. "zero (one | markedOne)* zero+".
+Concatenation is juxtaposition, and an empty alternative, as in "(zero |)", matches the
+empty input. 'e' is the NFA's epsilon symbol and cannot appear in a pattern.
+
+Like any NFA or DFA, a compiled pattern raises ValueError from accepts() on inputs that
+leave it (a symbol it has no transition on); a ProductDFA of compiled patterns counts
+those as non-matching instead.
+"""
+from collections import OrderedDict
+
+from lfa.machines import load_module
+
+OPERATORS = "|*+?()"
+
+DEFAULT_CACHE_SIZE = 128
+
+
+class RegexError(ValueError):
+    """A pattern that cannot be parsed."""
+
+
+def tokenize(pattern):
+    """Splits a pattern into operator characters and symbol words."""
+    tokens = []
+    word = []
+    for char in pattern:
+        if char.isspace() or char in OPERATORS:
+            if word:
+                tokens.append("".join(word))
+                word = []
+            if not char.isspace():
+                tokens.append(char)
+        else:
+            word.append(char)
+    if word:
+        tokens.append("".join(word))
+    return tokens
+
+
+class _Thompson:
+    """
+    Thompson construction: every subexpression becomes a fragment (start, end) with one
+    entry and one exit state, glued to the others by epsilon moves.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.tokens = tokenize(pattern)
+        self.position = 0
+        self.states = []
+        self.symbols = set()
+        self.transitions = {}
+
+    def state(self):
+        name = f"r{len(self.states)}"
+        self.states.append(name)
+        return name
+
+    def add(self, from_state, symbol, to_state):
+        self.transitions.setdefault((from_state, symbol), set()).add(to_state)
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def build(self):
+        start, end = self.alternation()
+        if self.peek() is not None:
+            raise RegexError(f"Unbalanced ')' in pattern '{self.pattern}'.")
+        return start, end
+
+    def alternation(self):
+        branches = [self.concatenation()]
+        while self.peek() == "|":
+            self.position += 1
+            branches.append(self.concatenation())
+        if len(branches) == 1:
+            return branches[0]
+        start, end = self.state(), self.state()
+        for branch_start, branch_end in branches:
+            self.add(start, "e", branch_start)
+            self.add(branch_end, "e", end)
+        return start, end
+
+    def concatenation(self):
+        fragment = None
+        while self.peek() not in (None, "|", ")"):
+            start, end = self.repetition()
+            if fragment is None:
+                fragment = (start, end)
+            else:
+                self.add(fragment[1], "e", start)
+                fragment = (fragment[0], end)
+        if fragment is None:
+            # empty: matches the empty input
+            state = self.state()
+            fragment = (state, state)
+        return fragment
+
+    def repetition(self):
+        inner_start, inner_end = self.atom()
+        while self.peek() in ("*", "+", "?"):
+            operator = self.tokens[self.position]
+            self.position += 1
+            start, end = self.state(), self.state()
+            self.add(start, "e", inner_start)
+            self.add(inner_end, "e", end)
+            if operator in ("*", "?"):
+                self.add(start, "e", end)
+            if operator in ("*", "+"):
+                self.add(inner_end, "e", inner_start)
+            inner_start, inner_end = start, end
+        return inner_start, inner_end
+
+    def atom(self):
+        token = self.peek()
+        if token == "(":
+            self.position += 1
+            fragment = self.alternation()
+            if self.peek() != ")":
+                raise RegexError(f"Missing ')' in pattern '{self.pattern}'.")
+            self.position += 1
+            return fragment
+        if token in OPERATORS:
+            raise RegexError(f"Nothing to repeat before '{token}' in pattern '{self.pattern}'.")
+        if token == "e":
+            raise RegexError(f"Symbol 'e' is reserved for epsilon moves, in pattern '{self.pattern}'.")
+        self.position += 1
+        self.symbols.add(token)
+        start, end = self.state(), self.state()
+        self.add(start, token, end)
+        return start, end
+
+
+def to_nfa(pattern, alphabet=None):
+    """
+    The Thompson NFA of a pattern. Its alphabet is the pattern's symbols plus alphabet, if
+    given, so that the symbols of a whole rule set can share one alphabet.
+    """
+    builder = _Thompson(pattern)
+    start, end = builder.build()
+    symbols = builder.symbols | set(alphabet or ())
+    return load_module("nfa").NFA(builder.states, symbols, builder.transitions, start, [end])
+
+
+def to_dfa(pattern, alphabet=None):
+    """The minimized DFA of a pattern, see to_nfa()."""
+    dfa, _ = to_nfa(pattern, alphabet).determinize().minimize()
+    return dfa
+
+
+class PatternCache:
+    """
+    Compiled patterns keyed by (pattern, alphabet, dfa), keeping the maxsize most recently
+    used ones. The machines are shared between callers and must not be modified.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, pattern, alphabet=None, dfa=False):
+        """The NFA of a pattern, or its minimized DFA with dfa=True."""
+        key = (pattern, frozenset(alphabet or ()), dfa)
+        machine = self.cache.get(key)
+        if machine is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return machine
+        self.misses += 1
+        machine = to_dfa(pattern, alphabet) if dfa else to_nfa(pattern, alphabet)
+        if len(self.cache) >= self.maxsize:
+            self.cache.popitem(last=False)
+        self.cache[key] = machine
+        return machine
+
+    def clear(self):
+        self.cache.clear()
+
+
+_default_cache = PatternCache()
+
+
+def compile_pattern(pattern, alphabet=None, dfa=False):
+    """PatternCache.compile() on a module-wide cache of DEFAULT_CACHE_SIZE patterns."""
+    return _default_cache.compile(pattern, alphabet, dfa)
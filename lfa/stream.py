@@ -0,0 +1,30 @@
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def iter_symbols(filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lazily yields the whitespace separated symbols of a file, reading it chunk_size
+    characters at a time, so memory stays constant however large the input is.
+    The file is opened right away, so a missing file raises here and not on first use.
+    """
+    file = open(filename, "r")
+    return _read_symbols(file, chunk_size)
+
+
+def _read_symbols(file, chunk_size):
+    with file:
+        pending = ""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            chunk = pending + chunk
+            symbols = chunk.split()
+            # a symbol touching the end of the chunk may continue in the next one
+            if symbols and not chunk[-1].isspace():
+                pending = symbols.pop()
+            else:
+                pending = ""
+            yield from symbols
+        if pending:
+            yield pending
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import load_module
+
+dfa_machine = load_module("dfa")
+
+
+def _random_dfa(rng, alphabet):
+    states = [f"s{i:02d}" for i in range(rng.randint(1, 20))]
+    transitions = {(state, symbol): rng.choice(states)
+                   for state in states for symbol in alphabet if rng.random() < 0.85}
+    accept = rng.sample(states, rng.randint(0, len(states)))
+    return dfa_machine.DFA(states, alphabet, transitions, states[0], accept)
+
+
+def _moore_size(dfa):
+    # number of classes of Moore's partition refinement over the reachable states, with a
+    # missing transition going to a dead class of its own
+    reachable = dfa.reachable_states()
+    alphabet = sorted(dfa.alphabet)
+    classes = {state: state in dfa.accept_states for state in reachable}
+    while True:
+        signatures = {state: (classes[state], tuple(classes.get(dfa.transition_function.get((state, symbol)), "dead")
+                                                    for symbol in alphabet))
+                      for state in reachable}
+        ids = {}
+        refined = {state: ids.setdefault(signatures[state], len(ids)) for state in reachable}
+        if len(ids) == len(set(classes.values())):
+            return len(ids)
+        classes = refined
+
+
+def _outcome(dfa, input_string):
+    try:
+        return dfa.accepts(input_string)
+    except ValueError:
+        return "error"
+
+
+def test_minimize_matches_moore_and_keeps_the_language():
+    rng = random.Random(5)
+    alphabet = ["a", "b"]
+    for _ in range(300):
+        dfa = _random_dfa(rng, alphabet)
+        minimal, mapping = dfa.minimize()
+        assert len(minimal.states) == _moore_size(dfa)
+        assert sorted(state for members in mapping.values() for state in members) == sorted(dfa.reachable_states())
+        for _ in range(30):
+            input_string = " ".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            assert _outcome(minimal, input_string) == _outcome(dfa, input_string)
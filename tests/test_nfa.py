@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import load_module
+
+nfa_machine = load_module("nfa")
+EPSILON = nfa_machine.EPSILON
+
+
+def _closure(states, transitions):
+    closure = set(states)
+    stack = list(closure)
+    while stack:
+        state = stack.pop()
+        for next_state in transitions.get((state, EPSILON), ()):
+            if next_state not in closure:
+                closure.add(next_state)
+                stack.append(next_state)
+    return closure
+
+
+def _reference(nfa, input_symbols):
+    # the epsilon-NFA simulated directly, closing over epsilon moves after every step
+    current_states = _closure({nfa.start_state}, nfa.transition_function)
+    for symbol in input_symbols:
+        if symbol not in nfa.alphabet:
+            return "invalid"
+        next_states = set()
+        for state in current_states:
+            next_states |= nfa.transition_function.get((state, symbol), set())
+        if not next_states:
+            return "stuck"
+        current_states = _closure(next_states, nfa.transition_function)
+    return bool(current_states & nfa.accept_states)
+
+
+def _outcome(accepts, input_symbols):
+    try:
+        return accepts(input_symbols)
+    except ValueError as error:
+        return "invalid" if "Invalid" in str(error) else "stuck"
+
+
+def _random_nfa(rng):
+    # dense epsilon moves, so that most machines have epsilon cycles
+    states = [f"q{i}" for i in range(rng.randint(1, 9))]
+    transitions = {}
+    for state in states:
+        for symbol in ("x", "y", EPSILON):
+            if rng.random() < (0.5 if symbol == EPSILON else 0.6):
+                transitions[(state, symbol)] = {rng.choice(states) for _ in range(rng.randint(1, 3))}
+    accept = [state for state in states if rng.random() < 0.3]
+    return nfa_machine.NFA(states, ["x", "y"], transitions, "q0", accept), transitions
+
+
+def test_epsilon_closures_match_naive_search():
+    rng = random.Random(19)
+    for _ in range(1000):
+        _, transitions = _random_nfa(rng)
+        epsilon_moves = {state: targets for (state, symbol), targets in transitions.items() if symbol == EPSILON}
+        closures = nfa_machine._epsilon_closures(epsilon_moves)
+        for state, closure in closures.items():
+            assert closure == _closure({state}, transitions)
+
+
+def test_engines_match_epsilon_nfa_simulation():
+    rng = random.Random(19)
+    for _ in range(1000):
+        nfa, _ = _random_nfa(rng)
+        compiled = nfa.compile()
+        lazy = nfa.lazy(max_states=3)
+        dfa = nfa.determinize()
+        for _ in range(10):
+            input_symbols = [rng.choice("xy" if rng.random() < 0.95 else "xyz") for _ in range(rng.randint(0, 8))]
+            expected = _reference(nfa, input_symbols)
+            for accepts in (nfa.accepts, compiled.accepts, lazy.accepts,
+                            lambda symbols: dfa.accepts(" ".join(symbols))):
+                assert _outcome(accepts, input_symbols) == expected
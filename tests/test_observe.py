@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import ROOT, parse_config
+from lfa.observe import Profiler
+
+
+def test_pda_transition_hits_count_each_move_once():
+    pda = parse_config("pda", os.path.join(ROOT, "PDA", "pda_config.txt"))
+    for engine in ("dfs", "memo"):
+        profiler = Profiler()
+        assert pda.accepts("zero one", engine=engine, observer=profiler)
+        assert profiler.transition_hits == {
+            ("q0", "zero", "Z"): 1,
+            ("q0", "one", "X"): 1,
+            ("q1", "e", "Z"): 1,
+        }
+
+
+def test_tm_head_travel_adds_up_over_reused_profiler():
+    tm = parse_config("tm", os.path.join(ROOT, "TuringMachine", "tm_config.txt"))
+    symbols = ["zero", "one"]
+    profiler = Profiler()
+    tm.accepts(symbols, observer=profiler)
+    once = profiler.head_travel
+    assert once > 0
+    tm.accepts(symbols, observer=profiler)
+    assert profiler.head_travel == 2 * once
@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import load_module
+from lfa.observe import Profiler
+
+pda_machine = load_module("pda")
+
+
+def test_deterministic_engine_revisits_top_after_looking_under_it():
+    # (s, X) comes up twice on the way to u, but the run pops the X in between and reads the
+    # Z under it, so seeing (s, X) again is not a loop
+    transitions = {
+        ("p", "e", "Z"): [("s", ["X", "Z"])],
+        ("s", "e", "X"): [("t", ["e"])],
+        ("t", "e", "Z"): [("s", ["X", "Y", "Z"])],
+        ("t", "e", "Y"): [("u", ["e"])],
+    }
+    pda = pda_machine.PDA(["p", "s", "t", "u"], ["a"], ["Z", "X", "Y"], transitions, "p", "Z", ["u"])
+    assert pda.deterministic
+    for engine in ("dfs", "memo", "saturation", "deterministic", "auto"):
+        assert pda.accepts("", engine=engine)
+
+
+def test_deterministic_engine_rejects_epsilon_loops():
+    for stack_push in (["Z"], ["Z", "Z"]):
+        pda = pda_machine.PDA(["p", "q"], ["a"], ["Z"], {("p", "e", "Z"): [("p", stack_push)]}, "p", "Z", ["q"])
+        assert pda.deterministic
+        assert not pda.accepts("", engine="deterministic")
+
+
+def test_stream_stops_at_pushing_epsilon_loops():
+    pda = pda_machine.PDA(["q0"], ["a"], ["Z"], {("q0", "e", "e"): [("q0", ["Z", "Z"])]}, "q0", "Z", ["q0"])
+    assert pda.accepts(iter([]))
+    # with input left, the loop has to be explored and runs out of the budget
+    assert not pda.accepts(iter(["a"]), max_configs=1000)
+
+
+def test_iterable_input_honours_engine_and_observer():
+    pda = pda_machine.PDA(["q0", "q1"], ["a"], ["Z"], {("q0", "a", "Z"): [("q1", ["Z"])]}, "q0", "Z", ["q1"])
+    for engine in ("dfs", "memo", "saturation", "deterministic"):
+        assert pda.accepts(iter(["a"]), engine=engine)
+    profiler = Profiler()
+    assert pda.accepts(["a"], engine="dfs", observer=profiler)
+    assert profiler.transition_hits == {("q0", "a", "Z"): 1}
+
+
+def _random_pda(rng):
+    # epsilon moves only go to later states, so the dfs engine always terminates
+    states = ["q0", "q1", "q2", "q3"]
+    stack_alphabet = ["Z", "X", "Y"]
+    transitions = {}
+    for _ in range(rng.randint(1, 7)):
+        from_index = rng.randrange(len(states))
+        input_sym = rng.choice(["a", "b", "e"])
+        if input_sym == "e":
+            if from_index == len(states) - 1:
+                continue
+            to_state = rng.choice(states[from_index + 1:])
+        else:
+            to_state = rng.choice(states)
+        key = (states[from_index], input_sym, rng.choice(stack_alphabet + ["e"]))
+        stack_push = [rng.choice(stack_alphabet + ["e"]) for _ in range(rng.randint(1, 3))]
+        transitions.setdefault(key, []).append((to_state, stack_push))
+    return pda_machine.PDA(states, ["a", "b"], stack_alphabet, transitions, "q0", "Z", [rng.choice(states)])
+
+
+def test_engines_match_dfs():
+    rng = random.Random(8)
+    for _ in range(1500):
+        pda = _random_pda(rng)
+        for _ in range(5):
+            symbols = [rng.choice("ab") for _ in range(rng.randint(0, 6))]
+            input_string = " ".join(symbols)
+            expected = pda.accepts(input_string, engine="dfs")
+            assert pda.accepts(input_string, engine="memo") == expected
+            assert pda.accepts(input_string, engine="saturation") == expected
+            assert pda.accepts(iter(symbols)) == expected
+            if pda.deterministic:
+                assert pda.accepts(input_string, engine="deterministic") == expected
@@ -0,0 +1,46 @@
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa import regex
+
+# every symbol word stands for one character of an equivalent Python pattern
+LETTERS = {"zero": "a", "one": "b", "markedZero": "c"}
+
+
+def _random_pattern(rng, depth=0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.3:
+        return rng.choice(list(LETTERS)) if rng.random() < 0.9 else ""
+    if roll < 0.65:
+        return _random_pattern(rng, depth + 1) + " " + _random_pattern(rng, depth + 1)
+    if roll < 0.8:
+        return "(" + _random_pattern(rng, depth + 1) + "|" + _random_pattern(rng, depth + 1) + ")"
+    return "(" + _random_pattern(rng, depth + 1) + ")" + rng.choice("*+?")
+
+
+def _python_pattern(pattern):
+    return "".join(LETTERS.get(token, token) for token in regex.tokenize(pattern))
+
+
+def _outcome(accepts, input_symbols):
+    try:
+        return accepts(input_symbols)
+    except ValueError:
+        return False
+
+
+def test_compiled_patterns_match_python_re():
+    rng = random.Random(20)
+    for _ in range(1000):
+        pattern = _random_pattern(rng)
+        expected = re.compile(_python_pattern(pattern))
+        nfa = regex.to_nfa(pattern, alphabet=LETTERS)
+        dfa = regex.to_dfa(pattern, alphabet=LETTERS)
+        for _ in range(20):
+            input_symbols = [rng.choice(list(LETTERS)) for _ in range(rng.randint(0, 7))]
+            matched = bool(expected.fullmatch("".join(LETTERS[symbol] for symbol in input_symbols)))
+            assert _outcome(nfa.accepts, input_symbols) == matched
+            assert _outcome(dfa.accepts, " ".join(input_symbols)) == matched
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lfa.machines import load_module
+
+tm_machine = load_module("tm")
+
+
+def _random_tm(rng):
+    # self-loops that sweep left or right are common, so that the accelerated engine
+    # crosses runs in macro steps often
+    states = ["a", "b", "c", "acc", "rej"]
+    tape_alphabet = ["0", "1", "X", "_"]
+    transitions = {}
+    for state in states[:3]:
+        for symbol in tape_alphabet + ["Y"]:
+            roll = rng.random()
+            if roll < 0.4:
+                transitions[(state, symbol)] = (state, symbol, rng.choice("LR"))
+            elif roll < 0.9:
+                transitions[(state, symbol)] = (rng.choice(states), rng.choice(tape_alphabet), rng.choice("LRS"))
+    return tm_machine.TuringMachine(states, ["0", "1", "Y"], tape_alphabet, "_", transitions, "a", ["acc"], ["rej"])
+
+
+def _run(accepts, *args, **kwargs):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = accepts(*args, **kwargs)
+    return result, output.getvalue()
+
+
+def test_accelerated_engine_matches_plain_run():
+    rng = random.Random(11)
+    for _ in range(3000):
+        tm = _random_tm(rng)
+        compiled = tm.compile()
+        input_symbols = [rng.choice(["0", "1", "Y"] if rng.random() < 0.05 else ["0", "1", "0", "0"])
+                         for _ in range(rng.randint(0, 12))]
+        max_steps = rng.choice([1, 3, 5, 10, 50, 500])
+        expected = _run(tm.accepts, input_symbols, max_steps)
+        assert _run(compiled.accepts, input_symbols, max_steps, accelerate=True) == expected
+
+
+def test_accelerated_engine_counts_steps_per_cell():
+    tm = tm_machine.parse_tm_config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                                                 "TuringMachine", "tm_config.txt"))
+    compiled = tm.compile()
+    for n in range(12):
+        for input_symbols in (["zero"] * n + ["one"] * n, ["zero"] * n + ["one"] * (n + 1)):
+            for max_steps in (10, 100, 10000):
+                expected = _run(tm.accepts, input_symbols, max_steps)
+                assert _run(compiled.accepts, input_symbols, max_steps, accelerate=True) == expected